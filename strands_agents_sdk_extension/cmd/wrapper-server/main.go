@@ -1,6 +1,8 @@
 package main
 
 import (
+	"encoding/base64"
+	"encoding/hex"
 	"encoding/json"
 	"fmt"
 	"io"
@@ -15,6 +17,10 @@ import (
 	"github.com/strands/zero-trust-wrapper/pkg/sdk"
 )
 
+// maxBatchTasks caps /api/v1/sdk/execute/batch: the whole batch passes the
+// rate limiter as a single request, so it must not fan out without bound
+const maxBatchTasks = 20
+
 var (
 	identityMgr    *identity.Manager
 	policyEngine   *policy.PolicyEngine
@@ -57,17 +63,21 @@ func main() {
 	// HTTP endpoints - PUBLIC (no auth required)
 	http.Handle("/health", authMiddleware.ProtectPublic(handleHealth))
 	http.Handle("/api/v1/identity/register", authMiddleware.ProtectPublic(handleRegister))
+	http.Handle("/api/v1/identity/bootstrap", authMiddleware.ProtectPublic(handleBootstrap))
 	http.Handle("/api/v1/policy/roles", authMiddleware.ProtectPublic(handleGetRoles))
 
 	// HTTP endpoints - PROTECTED (auth + authorization required)
 	http.Handle("/api/v1/identity/list", authMiddleware.Protect(handleList, "agent:read"))
 	http.Handle("/api/v1/identity/verify", authMiddleware.Protect(handleVerify, "agent:read"))
+	http.Handle("/api/v1/identity/verify_batch", authMiddleware.Protect(handleVerifyBatch, "agent:read"))
 	http.Handle("/api/v1/identity/revoke", authMiddleware.Protect(handleRevoke, "agent:delete"))
 	http.Handle("/api/v1/audit/logs", authMiddleware.Protect(handleAuditLog, "audit:read"))
 	http.Handle("/api/v1/policy/assign-role", authMiddleware.ProtectPublic(handleAssignRole))
 	http.Handle("/api/v1/policy/agent-roles", authMiddleware.Protect(handleGetAgentRoles, "agent:read"))
 	http.Handle("/api/v1/sdk/health", authMiddleware.Protect(handleSDKHealth, "agent:read"))
 	http.Handle("/api/v1/sdk/execute", authMiddleware.Protect(handleExecuteAgent, "agent:write"))
+	http.Handle("/api/v1/sdk/execute/batch", authMiddleware.Protect(handleExecuteAgentBatch, "agent:write"))
+	http.Handle("/api/v1/sdk/execute/stream", authMiddleware.Protect(handleExecuteAgentStream, "agent:write"))
 	http.Handle("/api/v1/sdk/agents", authMiddleware.Protect(handleSDKAgents, "agent:read"))
 	http.Handle("/api/v1/ratelimit/stats", authMiddleware.Protect(handleRateLimitStats, "agent:read"))
 	http.Handle("/api/v1/analytics/anomalies", authMiddleware.Protect(handleGetAnomalies, "audit:read"))
@@ -162,6 +172,55 @@ func handleRegister(w http.ResponseWriter, r *http.Request) {
 	json.NewEncoder(w).Encode(agent)
 }
 
+// handleBootstrap registers an agent and assigns its role in a single request
+func handleBootstrap(w http.ResponseWriter, r *http.Request) {
+	if r.Method != http.MethodPost {
+		w.WriteHeader(http.StatusMethodNotAllowed)
+		return
+	}
+
+	var req struct {
+		AgentID string `json:"agent_id"`
+		Role    string `json:"role"`
+	}
+
+	body, _ := io.ReadAll(r.Body)
+	json.Unmarshal(body, &req)
+
+	if req.AgentID == "" || req.Role == "" {
+		w.WriteHeader(http.StatusBadRequest)
+		json.NewEncoder(w).Encode(map[string]string{"error": "agent_id and role required"})
+		return
+	}
+
+	// Validate the role up front so a bad request never leaves a half-bootstrapped agent
+	if _, exists := policyEngine.GetRoles()[req.Role]; !exists {
+		w.WriteHeader(http.StatusBadRequest)
+		json.NewEncoder(w).Encode(map[string]string{"error": fmt.Sprintf("role not found: %s", req.Role)})
+		return
+	}
+
+	agent, err := identityMgr.RegisterAgent(req.AgentID)
+	if err != nil {
+		w.WriteHeader(http.StatusConflict)
+		json.NewEncoder(w).Encode(map[string]string{"error": err.Error()})
+		return
+	}
+
+	if err := policyEngine.AssignRole(req.AgentID, req.Role); err != nil {
+		w.WriteHeader(http.StatusBadRequest)
+		json.NewEncoder(w).Encode(map[string]string{"error": err.Error()})
+		return
+	}
+
+	w.Header().Set("Content-Type", "application/json")
+	w.WriteHeader(http.StatusCreated)
+	json.NewEncoder(w).Encode(struct {
+		*identity.Agent
+		Role string `json:"role"`
+	}{agent, req.Role})
+}
+
 func handleList(w http.ResponseWriter, r *http.Request) {
 	if r.Method != http.MethodGet {
 		w.WriteHeader(http.StatusMethodNotAllowed)
@@ -177,24 +236,45 @@ func handleList(w http.ResponseWriter, r *http.Request) {
 	})
 }
 
+// verifyRequest is one signed nonce submitted for verification
+type verifyRequest struct {
+	AgentID      string `json:"agent_id"`
+	Signature    string `json:"signature"`
+	SignatureB64 string `json:"signature_b64"`
+	Nonce        string `json:"nonce"`
+}
+
+// normalize checks required fields and converts a base64 signature to hex
+func (v *verifyRequest) normalize() error {
+	// Clients may send the signature as hex or, more compactly, as base64
+	if v.Signature == "" && v.SignatureB64 != "" {
+		signature, err := base64.StdEncoding.DecodeString(v.SignatureB64)
+		if err != nil {
+			return fmt.Errorf("invalid signature_b64")
+		}
+		v.Signature = hex.EncodeToString(signature)
+	}
+
+	if v.AgentID == "" || v.Signature == "" {
+		return fmt.Errorf("agent_id and signature required")
+	}
+	return nil
+}
+
 func handleVerify(w http.ResponseWriter, r *http.Request) {
 	if r.Method != http.MethodPost {
 		w.WriteHeader(http.StatusMethodNotAllowed)
 		return
 	}
 
-	var req struct {
-		AgentID   string `json:"agent_id"`
-		Signature string `json:"signature"`
-		Nonce     string `json:"nonce"`
-	}
+	var req verifyRequest
 
 	body, _ := io.ReadAll(r.Body)
 	json.Unmarshal(body, &req)
 
-	if req.AgentID == "" || req.Signature == "" {
+	if err := req.normalize(); err != nil {
 		w.WriteHeader(http.StatusBadRequest)
-		json.NewEncoder(w).Encode(map[string]string{"error": "agent_id and signature required"})
+		json.NewEncoder(w).Encode(map[string]string{"error": err.Error()})
 		return
 	}
 
@@ -210,6 +290,55 @@ func handleVerify(w http.ResponseWriter, r *http.Request) {
 	})
 }
 
+func handleVerifyBatch(w http.ResponseWriter, r *http.Request) {
+	if r.Method != http.MethodPost {
+		w.WriteHeader(http.StatusMethodNotAllowed)
+		return
+	}
+
+	var req struct {
+		Items []verifyRequest `json:"items"`
+	}
+
+	body, _ := io.ReadAll(r.Body)
+	if err := json.Unmarshal(body, &req); err != nil {
+		w.WriteHeader(http.StatusBadRequest)
+		json.NewEncoder(w).Encode(map[string]string{"error": "invalid JSON"})
+		return
+	}
+
+	if len(req.Items) == 0 {
+		w.WriteHeader(http.StatusBadRequest)
+		json.NewEncoder(w).Encode(map[string]string{"error": "items required"})
+		return
+	}
+
+	// Each item is accepted or rejected on its own, like a single verify
+	results := make([]map[string]string, 0, len(req.Items))
+	for i := range req.Items {
+		item := &req.Items[i]
+		if err := item.normalize(); err != nil {
+			results = append(results, map[string]string{
+				"agent_id": item.AgentID,
+				"status":   "error",
+				"error":    err.Error(),
+			})
+			continue
+		}
+		results = append(results, map[string]string{
+			"agent_id": item.AgentID,
+			"status":   "verification_queued",
+		})
+	}
+
+	w.Header().Set("Content-Type", "application/json")
+	w.WriteHeader(http.StatusAccepted)
+	json.NewEncoder(w).Encode(map[string]interface{}{
+		"results": results,
+		"count":   len(results),
+	})
+}
+
 func handleRevoke(w http.ResponseWriter, r *http.Request) {
 	if r.Method != http.MethodPost {
 		w.WriteHeader(http.StatusMethodNotAllowed)
@@ -388,6 +517,123 @@ func handleExecuteAgent(w http.ResponseWriter, r *http.Request) {
 	json.NewEncoder(w).Encode(result)
 }
 
+func handleExecuteAgentStream(w http.ResponseWriter, r *http.Request) {
+	if r.Method != http.MethodPost {
+		w.WriteHeader(http.StatusMethodNotAllowed)
+		return
+	}
+
+	var req struct {
+		Task map[string]interface{} `json:"task"`
+	}
+
+	body, _ := io.ReadAll(r.Body)
+	err := json.Unmarshal(body, &req)
+	if err != nil {
+		w.WriteHeader(http.StatusBadRequest)
+		json.NewEncoder(w).Encode(map[string]string{"error": "invalid JSON"})
+		return
+	}
+
+	question, ok := req.Task["question"].(string)
+	if !ok || question == "" {
+		w.WriteHeader(http.StatusBadRequest)
+		json.NewEncoder(w).Encode(map[string]string{"error": "question required in task"})
+		return
+	}
+
+	agentID := middleware.GetAgentFromRequest(r)
+	stream, err := pythonBridge.ExecuteAgentStream(agentID, map[string]interface{}{"question": question})
+	if err != nil {
+		fmt.Printf("Python bridge ExecuteAgentStream error for agent %s: %v\n", agentID, err)
+		w.WriteHeader(http.StatusInternalServerError)
+		json.NewEncoder(w).Encode(map[string]string{"error": err.Error()})
+		return
+	}
+	defer stream.Close()
+
+	w.Header().Set("Content-Type", "application/x-ndjson")
+	w.WriteHeader(http.StatusOK)
+
+	// Relay chunks as they arrive so the caller sees the first tokens early
+	flusher, _ := w.(http.Flusher)
+	buf := make([]byte, 4096)
+	for {
+		n, readErr := stream.Read(buf)
+		if n > 0 {
+			if _, err := w.Write(buf[:n]); err != nil {
+				return
+			}
+			if flusher != nil {
+				flusher.Flush()
+			}
+		}
+		if readErr != nil {
+			return
+		}
+	}
+}
+
+func handleExecuteAgentBatch(w http.ResponseWriter, r *http.Request) {
+	if r.Method != http.MethodPost {
+		w.WriteHeader(http.StatusMethodNotAllowed)
+		return
+	}
+
+	var req struct {
+		Tasks []map[string]interface{} `json:"tasks"`
+	}
+
+	body, _ := io.ReadAll(r.Body)
+	err := json.Unmarshal(body, &req)
+	if err != nil {
+		w.WriteHeader(http.StatusBadRequest)
+		json.NewEncoder(w).Encode(map[string]string{"error": "invalid JSON"})
+		return
+	}
+
+	if len(req.Tasks) == 0 {
+		w.WriteHeader(http.StatusBadRequest)
+		json.NewEncoder(w).Encode(map[string]string{"error": "tasks required"})
+		return
+	}
+
+	if len(req.Tasks) > maxBatchTasks {
+		w.WriteHeader(http.StatusRequestEntityTooLarge)
+		json.NewEncoder(w).Encode(map[string]string{
+			"error": fmt.Sprintf("at most %d tasks per batch", maxBatchTasks),
+		})
+		return
+	}
+
+	tasks := make([]map[string]interface{}, 0, len(req.Tasks))
+	for _, task := range req.Tasks {
+		question, ok := task["question"].(string)
+		if !ok || question == "" {
+			w.WriteHeader(http.StatusBadRequest)
+			json.NewEncoder(w).Encode(map[string]string{"error": "question required in every task"})
+			return
+		}
+		tasks = append(tasks, map[string]interface{}{"question": question})
+	}
+
+	agentID := middleware.GetAgentFromRequest(r)
+	results, err := pythonBridge.ExecuteAgentBatch(agentID, tasks)
+	if err != nil {
+		fmt.Printf("Python bridge ExecuteAgentBatch error for agent %s: %v\n", agentID, err)
+		w.WriteHeader(http.StatusInternalServerError)
+		json.NewEncoder(w).Encode(map[string]string{"error": err.Error()})
+		return
+	}
+
+	w.Header().Set("Content-Type", "application/json")
+	w.WriteHeader(http.StatusOK)
+	json.NewEncoder(w).Encode(map[string]interface{}{
+		"results": results,
+		"count":   len(results),
+	})
+}
+
 func handleSDKAgents(w http.ResponseWriter, r *http.Request) {
 	if r.Method != http.MethodGet {
 		w.WriteHeader(http.StatusMethodNotAllowed)
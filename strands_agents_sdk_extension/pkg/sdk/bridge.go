@@ -81,6 +81,74 @@ func (b *Bridge) ExecuteAgent(agentID string, taskData map[string]interface{}) (
 	return result, nil
 }
 
+// ExecuteAgentStream executes an agent task on Python SDK and returns the ndjson
+// chunk stream; the caller must close it
+func (b *Bridge) ExecuteAgentStream(agentID string, taskData map[string]interface{}) (io.ReadCloser, error) {
+	payload := map[string]interface{}{
+		"agent_id": agentID,
+		"task":     taskData,
+	}
+
+	bodyBytes, err := json.Marshal(payload)
+	if err != nil {
+		return nil, fmt.Errorf("failed to marshal request: %w", err)
+	}
+
+	resp, err := b.httpClient.Post(
+		b.endpoint+"/execute/stream",
+		"application/json",
+		bytes.NewReader(bodyBytes),
+	)
+	if err != nil {
+		return nil, fmt.Errorf("failed to execute agent stream: %w", err)
+	}
+
+	if resp.StatusCode != http.StatusOK {
+		defer resp.Body.Close()
+		bodyText, _ := io.ReadAll(resp.Body)
+		return nil, fmt.Errorf("stream execution failed with status %d: %s", resp.StatusCode, string(bodyText))
+	}
+
+	return resp.Body, nil
+}
+
+// ExecuteAgentBatch executes several agent tasks on Python SDK in one request
+func (b *Bridge) ExecuteAgentBatch(agentID string, tasks []map[string]interface{}) ([]interface{}, error) {
+	payload := map[string]interface{}{
+		"agent_id": agentID,
+		"tasks":    tasks,
+	}
+
+	bodyBytes, err := json.Marshal(payload)
+	if err != nil {
+		return nil, fmt.Errorf("failed to marshal request: %w", err)
+	}
+
+	resp, err := b.httpClient.Post(
+		b.endpoint+"/execute_batch",
+		"application/json",
+		bytes.NewReader(bodyBytes),
+	)
+	if err != nil {
+		return nil, fmt.Errorf("failed to execute agent batch: %w", err)
+	}
+	defer resp.Body.Close()
+
+	if resp.StatusCode != http.StatusOK {
+		bodyText, _ := io.ReadAll(resp.Body)
+		return nil, fmt.Errorf("batch execution failed with status %d: %s", resp.StatusCode, string(bodyText))
+	}
+
+	var result struct {
+		Responses []interface{} `json:"responses"`
+	}
+	if err := json.NewDecoder(resp.Body).Decode(&result); err != nil {
+		return nil, fmt.Errorf("failed to decode response: %w", err)
+	}
+
+	return result.Responses, nil
+}
+
 // GetAgentInfo retrieves agent info from Python SDK
 func (b *Bridge) GetAgentInfo(agentID string) (map[string]interface{}, error) {
 	resp, err := b.httpClient.Get(b.endpoint + "/agents/" + agentID)
@@ -0,0 +1,21 @@
+"""
+Puts the python-agents directory on sys.path so agents can import strands_client,
+and configures the shared "agent" logger once per process
+"""
+
+import logging
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+log = logging.getLogger("agent")
+if not log.handlers:
+    # Bare messages on stdout, matching the previous print() output
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+    log.propagate = False
@@ -1,16 +1,21 @@
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    from . import _bootstrap  # noqa: F401
+except ImportError:
+    import _bootstrap  # noqa: F401
 
 from strands_client import StrandsAgentClient
-import time
-import json
+import aiohttp
+import asyncio
+import logging
+import orjson
 
-def main():
+log = logging.getLogger("agent")
+
+async def run(session: aiohttp.ClientSession) -> bool:
     """Agent 1: Data Processor"""
-    print("\n" + "="*60)
-    print("AGENT 1: Data Processor")
-    print("="*60 + "\n")
+    log.info("\n" + "="*60)
+    log.info("AGENT 1: Data Processor")
+    log.info("="*60 + "\n")
     
     # Create client
     client = StrandsAgentClient(
@@ -18,24 +23,17 @@ def main():
         wrapper_url="http://localhost:8443"
     )
     
-    # Step 1: Register
+    # Step 1: Register with admin role and verify
     try:
-        client.register_agent()
+        if not await asyncio.to_thread(client.bootstrap, "admin"):
+            log.info("Verification failed")
+            return False
     except Exception as e:
-        print(f"Registration failed: {e}")
-        return
-    
-    # Step 2: Assign admin role FIRST (before verify)
-    client.assign_role("admin")
-    time.sleep(0.5)
+        log.info("Bootstrap failed: %s", e)
+        return False
     
-    # Step 3: Verify
-    if not client.verify_with_wrapper():
-        print("Verification failed")
-        return
-    
-    # Step 4: Execute tasks
-    print("\n[AGENT-1] Starting tasks...\n")
+    # Step 2: Execute tasks
+    log.info("\n[AGENT-1] Starting tasks...\n")
     
     tasks = [
         {"action": "process_data", "data_id": "dataset-001"},
@@ -43,27 +41,41 @@ def main():
         {"action": "report", "data_id": "dataset-001"},
     ]
     
-    for task in tasks:
-        try:
-            print(f"[AGENT-1] Executing: {task['action']}")
-            result = client.execute_task(task)
-            print(f"[AGENT-1] ✓ Result: {json.dumps(result)}\n")
-            time.sleep(0.3)
-        except Exception as e:
-            print(f"[AGENT-1] ✗ Failed: {e}\n")
+    # Tasks are independent, so issue them concurrently over the shared session
+    results = await asyncio.gather(
+        *(client.aexecute_task(session, task) for task in tasks),
+        return_exceptions=True
+    )
+    
+    for task, result in zip(tasks, results):
+        log.info("[AGENT-1] Executing: %s", task['action'])
+        if isinstance(result, Exception):
+            log.info("[AGENT-1] ✗ Failed: %s\n", result)
+        elif log.isEnabledFor(logging.INFO):
+            log.info("[AGENT-1] ✓ Result: %s\n", orjson.dumps(result).decode())
+    
+    # Step 3: Check rate limits
+    log.info("[AGENT-1] Checking rate limits...")
+    stats = await asyncio.to_thread(client.get_rate_limit_stats)
+    log.info("[AGENT-1] Available tokens: %s", stats.get('available', 'N/A'))
+    log.info("[AGENT-1] Total requests: %s\n", stats.get('total_requests', 'N/A'))
     
-    # Step 5: Check rate limits
-    print("[AGENT-1] Checking rate limits...")
-    stats = client.get_rate_limit_stats()
-    print(f"[AGENT-1] Available tokens: {stats.get('available', 'N/A')}")
-    print(f"[AGENT-1] Total requests: {stats.get('total_requests', 'N/A')}\n")
+    # Step 4: Check anomalies
+    log.info("[AGENT-1] Checking anomalies...")
+    anomalies = await asyncio.to_thread(client.get_anomalies)
+    log.info("[AGENT-1] Anomalies detected: %s\n", len(anomalies))
     
-    # Step 6: Check anomalies
-    print("[AGENT-1] Checking anomalies...")
-    anomalies = client.get_anomalies()
-    print(f"[AGENT-1] Anomalies detected: {len(anomalies)}\n")
+    log.info("[AGENT-1] ✓ Agent 1 completed successfully\n")
+    return True
+
+
+def main():
+    async def _main():
+        connector = aiohttp.TCPConnector(limit=10, keepalive_timeout=30)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            return await run(session)
     
-    print("[AGENT-1] ✓ Agent 1 completed successfully\n")
+    return asyncio.run(_main())
 
 
 if __name__ == "__main__":
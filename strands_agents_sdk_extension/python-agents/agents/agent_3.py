@@ -1,17 +1,22 @@
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    from . import _bootstrap  # noqa: F401
+except ImportError:
+    import _bootstrap  # noqa: F401
 
 from strands_client import StrandsAgentClient
-import time
-import json
+import aiohttp
+import asyncio
+import logging
+import orjson
 
+log = logging.getLogger("agent")
 
-def main():
+
+async def run(session: aiohttp.ClientSession) -> bool:
     """Agent 3: Read-only Service"""
-    print("\n" + "="*60)
-    print("AGENT 3: Read-only Service")
-    print("="*60 + "\n")
+    log.info("\n" + "="*60)
+    log.info("AGENT 3: Read-only Service")
+    log.info("="*60 + "\n")
     
     # Create client
     client = StrandsAgentClient(
@@ -19,24 +24,17 @@ def main():
         wrapper_url="http://localhost:8443"
     )
     
-    # Step 1: Register
+    # Step 1: Register with service role and verify
     try:
-        client.register_agent()
+        if not await asyncio.to_thread(client.bootstrap, "service"):
+            log.info("Verification failed")
+            return False
     except Exception as e:
-        print(f"Registration failed: {e}")
-        return
-    
-    # Step 2: Assign service role FIRST (before verify)
-    client.assign_role("service")
-    time.sleep(0.5)
+        log.info("Bootstrap failed: %s", e)
+        return False
     
-    # Step 3: Verify
-    if not client.verify_with_wrapper():
-        print("Verification failed")
-        return
-    
-    # Step 4: Execute read-only tasks
-    print("\n[AGENT-3] Starting read-only operations...\n")
+    # Step 2: Execute read-only tasks
+    log.info("\n[AGENT-3] Starting read-only operations...\n")
     
     tasks = [
         {"action": "list_datasets"},
@@ -44,22 +42,36 @@ def main():
         {"action": "check_status"},
     ]
     
-    for task in tasks:
-        try:
-            print(f"[AGENT-3] Executing: {task['action']}")
-            result = client.execute_task(task)
-            print(f"[AGENT-3] ✓ Result: {json.dumps(result)}\n")
-            time.sleep(0.3)
-        except Exception as e:
-            print(f"[AGENT-3] ✗ Failed: {e}\n")
+    # Tasks are independent, so issue them concurrently over the shared session
+    results = await asyncio.gather(
+        *(client.aexecute_task(session, task) for task in tasks),
+        return_exceptions=True
+    )
+    
+    for task, result in zip(tasks, results):
+        log.info("[AGENT-3] Executing: %s", task['action'])
+        if isinstance(result, Exception):
+            log.info("[AGENT-3] ✗ Failed: %s\n", result)
+        elif log.isEnabledFor(logging.INFO):
+            log.info("[AGENT-3] ✓ Result: %s\n", orjson.dumps(result).decode())
+    
+    # Step 3: Check rate limits
+    log.info("[AGENT-3] Checking rate limits...")
+    stats = await asyncio.to_thread(client.get_rate_limit_stats)
+    log.info("[AGENT-3] Available tokens: %s", stats.get('available', 'N/A'))
+    log.info("[AGENT-3] Total requests: %s\n", stats.get('total_requests', 'N/A'))
     
-    # Step 5: Check rate limits
-    print("[AGENT-3] Checking rate limits...")
-    stats = client.get_rate_limit_stats()
-    print(f"[AGENT-3] Available tokens: {stats.get('available', 'N/A')}")
-    print(f"[AGENT-3] Total requests: {stats.get('total_requests', 'N/A')}\n")
+    log.info("[AGENT-3] ✓ Agent 3 completed successfully\n")
+    return True
+
+
+def main():
+    async def _main():
+        connector = aiohttp.TCPConnector(limit=10, keepalive_timeout=30)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            return await run(session)
     
-    print("[AGENT-3] ✓ Agent 3 completed successfully\n")
+    return asyncio.run(_main())
 
 
 if __name__ == "__main__":
@@ -2,104 +2,286 @@
 Mock SDK that uses real Strands Agent with Bedrock (secure credentials)
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, stream_with_context
+import asyncio
 import os
-import sys
-import json
-
-# Import Strands and Bedrock
-try:
-    from strands import Agent
-    from strands.models import BedrockModel
-    import boto3
-except ImportError:
-    print("Error: strands and boto3 must be installed")
-    print("pip install strands boto3")
-    sys.exit(1)
+import threading
+import orjson
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 app = Flask(__name__)
 
-# Initialize Bedrock agent with credentials from environment variables
-try:
-    session = boto3.Session(
+def ojsonify(obj, status=200):
+    """jsonify replacement that encodes with orjson"""
+    return Response(orjson.dumps(obj), status=status, mimetype='application/json')
+
+@lru_cache(maxsize=1)
+def _session():
+    """boto3 Session with credentials from environment variables, built once"""
+    import boto3
+    return boto3.Session(
         aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
         aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
         region_name=os.getenv("AWS_REGION", "us-east-2")
     )
-    
-    nova_model = BedrockModel(
-        boto_session=session,
-        model_config={
-            "model_id": "us.amazon.nova-premier-v1:0",
-            "temperature": 0.8,
-        }
-    )
-    
-    agent = Agent(model=nova_model)
-    AGENT_READY = True
-    
-except Exception as e:
-    print(f"Warning: Could not initialize Bedrock agent: {e}")
-    print("Falling back to mock responses")
-    AGENT_READY = False
-    agent = None
-
-# Add health check endpoint
-@app.route('/health', methods=['GET'])
-def health_check():
-    return jsonify({"status": "healthy"})
+
+@lru_cache(maxsize=1)
+def get_model():
+    """Build the Bedrock model on first use; None means answers come from the mock table
+
+    strands and boto3 are imported here rather than at module level so the
+    server starts, and /health answers, without paying for them.
+    """
+    try:
+        from strands.models import BedrockModel
+        from botocore.config import Config
+
+        # Pooled keep-alive connections let concurrent /execute calls skip the TLS handshake
+        boto_config = Config(
+            max_pool_connections=50,
+            retries={"max_attempts": 3, "mode": "adaptive"},
+            tcp_keepalive=True
+        )
+
+        return BedrockModel(
+            boto_session=_session(),
+            boto_client_config=boto_config,
+            model_config={
+                "model_id": "us.amazon.nova-premier-v1:0",
+                "temperature": 0.8,
+            }
+        )
+    except Exception as e:
+        print(f"Warning: Could not initialize Bedrock agent: {e}")
+        print("Falling back to mock responses")
+        return None
+
+# An Agent keeps its conversation history and cannot serve parallel calls,
+# so each server or batch worker thread gets its own on the shared model
+_agents = threading.local()
+
+def get_agent():
+    """The calling thread's Bedrock agent, or None when answers come from the mock table"""
+    model = get_model()
+    if model is None:
+        return None
+    agent = getattr(_agents, "agent", None)
+    if agent is None:
+        from strands import Agent
+        agent = _agents.agent = Agent(model=model)
+    return agent
+
+# Fallback mock responses, built once at import
+MOCK_RESPONSES = {
+    "What is agentic AI?": "Agentic AI refers to artificial intelligence systems that can act autonomously to achieve specific goals. These systems can make decisions, take actions, and adapt their behavior based on their environment and objectives.",
+    "Explain zero-trust security": "Zero-trust security is a cybersecurity framework that requires all users and systems, whether inside or outside the network, to be authenticated, authorized, and validated before gaining access to applications and data. It operates on the principle of 'never trust, always verify'.",
+    "How do autonomous agents work?": "Autonomous agents are software systems that can operate independently to achieve goals. They use sensors to perceive their environment, decision-making algorithms to determine actions, and actuators to execute those actions. They often employ AI and machine learning to improve their performance over time."
+}
+DEFAULT_MOCK_RESPONSE = "I don't have specific information about that topic."
+
+# Pre-encoded response bodies for the mock path
+MOCK_BODIES = {q: orjson.dumps({"response": r}) for q, r in MOCK_RESPONSES.items()}
+DEFAULT_MOCK_BODY = orjson.dumps({"response": DEFAULT_MOCK_RESPONSE})
+
+class TokenBucket:
+    """Token bucket allowing bursts of `cap` calls at a long-term `rate` per second"""
+    __slots__ = ('tokens', 'last', 'rate', 'cap')
+
+    def __init__(self, rate, cap):
+        self.rate = rate
+        self.cap = cap
+        self.tokens = cap
+        self.last = time.monotonic()
+
+    def take(self, n=1):
+        now = time.monotonic()
+        self.tokens = min(self.cap, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+        if self.tokens >= n:
+            self.tokens -= n
+            return True
+        return False
+
+# Per-agent Bedrock budget, so a burst from one agent cannot blow the account quota
+BUCKET_RATE = float(os.getenv("BEDROCK_RATE_PER_SEC", "5"))
+BUCKET_CAPACITY = float(os.getenv("BEDROCK_BURST", "20"))
+buckets = {}
+buckets_lock = threading.Lock()
+
+def _allow(data, n=1):
+    """Take n tokens from the bucket of the agent named in the request body"""
+    agent_id = data.get('agent_id') or "anonymous"
+    with buckets_lock:
+        bucket = buckets.get(agent_id)
+        if bucket is None:
+            bucket = buckets[agent_id] = TokenBucket(rate=BUCKET_RATE, cap=BUCKET_CAPACITY)
+        return bucket.take(n)
+
+def _extract_question(data):
+    """Accept both {"question": "..."} and {"task": {"question": "..."}} formats"""
+    question = data.get('question')
+    if not question and 'task' in data:
+        question = data['task'].get('question')
+    return question or "Hello"
+
+def _answer(question):
+    """Answer a single question with the real Strands agent or the mock table"""
+    if get_agent() is None:
+        return MOCK_RESPONSES.get(question, DEFAULT_MOCK_RESPONSE)
+    return _invoke(question)
+
+@lru_cache(maxsize=1024)
+def _invoke(question):
+    """Ask the Bedrock agent; repeated questions are answered from the cache"""
+    raw = get_agent()(question)
+    # Safely serialize any kind of object to JSON string using default=str
+    try:
+        return orjson.dumps(raw, default=str).decode()
+    except Exception:
+        return str(raw)
 
 @app.route('/execute', methods=['POST'])
 def execute():
     """Execute with real Strands agent or fallback"""
     try:
         data = request.json
-        # Accept both {"question": "..."} and {"task": {"question": "..."}} formats
-        question = data.get('question')
-        if not question and 'task' in data:
-            question = data['task'].get('question')
-        if not question:
-            question = "Hello"
-
-        if not AGENT_READY:
-            # Fallback mock responses
-            mock_responses = {
-                "What is agentic AI?": "Agentic AI refers to artificial intelligence systems that can act autonomously to achieve specific goals. These systems can make decisions, take actions, and adapt their behavior based on their environment and objectives.",
-                "Explain zero-trust security": "Zero-trust security is a cybersecurity framework that requires all users and systems, whether inside or outside the network, to be authenticated, authorized, and validated before gaining access to applications and data. It operates on the principle of 'never trust, always verify'.",
-                "How do autonomous agents work?": "Autonomous agents are software systems that can operate independently to achieve goals. They use sensors to perceive their environment, decision-making algorithms to determine actions, and actuators to execute those actions. They often employ AI and machine learning to improve their performance over time."
-            }
-            response = mock_responses.get(question, "I don't have specific information about that topic.")
-            return jsonify({"response": response}), 200
+        if not _allow(data):
+            return ojsonify({"status": "error", "message": "rate limit exceeded"}, 429)
+
+        question = _extract_question(data)
+
+        if get_agent() is None:
+            body = MOCK_BODIES.get(question, DEFAULT_MOCK_BODY)
+            return Response(body, status=200, mimetype='application/json')
 
-        # If AGENT_READY and agent is set, use the real agent
         try:
-            raw = agent(question) if agent else f"Mock response to: {question}"
-            # Safely serialize any kind of object to JSON string using default=str
-            try:
-                response_text = json.dumps(raw, default=str)
-            except Exception:
-                response_text = str(raw)
-            return jsonify({"response": response_text}), 200
+            return ojsonify({"response": _answer(question)}, 200)
         except Exception as e:
             # Print full traceback to the server console for debugging
             import traceback
             traceback.print_exc()
-            return jsonify({"status": "error", "message": str(e)}), 500
+            return ojsonify({"status": "error", "message": str(e)}, 500)
     except Exception as e:
-        return jsonify({"status": "error", "message": str(e)}), 500
+        return ojsonify({"status": "error", "message": str(e)}, 500)
+
+def _stream_chunks(question):
+    """Yield text chunks from the agent as Bedrock generates them"""
+    model = get_model()
+    if model is None:
+        yield _answer(question)
+        return
+
+    # A client disconnect closes the stream before the assistant turn is
+    # recorded, so a private Agent takes the half-finished history with it
+    # instead of leaving this thread's shared one unusable
+    from strands import Agent
+    agent = Agent(model=model)
+
+    # Flask handlers are synchronous, so drive the async stream on a private loop
+    loop = asyncio.new_event_loop()
+    events = agent.stream_async(question)
+    try:
+        while True:
+            try:
+                event = loop.run_until_complete(events.__anext__())
+            except StopAsyncIteration:
+                break
+            if "data" in event:
+                yield event["data"]
+    finally:
+        loop.run_until_complete(events.aclose())
+        loop.close()
+
+@app.route('/execute/stream', methods=['POST'])
+def execute_stream():
+    """Execute with the Strands agent, streaming ndjson chunks as they arrive"""
+    try:
+        data = request.json
+        if not _allow(data):
+            return ojsonify({"status": "error", "message": "rate limit exceeded"}, 429)
+
+        question = _extract_question(data)
+
+        def generate():
+            try:
+                for chunk in _stream_chunks(question):
+                    yield orjson.dumps({"chunk": chunk}) + b"\n"
+                yield orjson.dumps({"done": True}) + b"\n"
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
+                yield orjson.dumps({"status": "error", "message": str(e)}) + b"\n"
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    except Exception as e:
+        return ojsonify({"status": "error", "message": str(e)}, 500)
+
+@app.route('/execute_batch', methods=['POST'])
+def execute_batch():
+    """Execute several tasks in one request, overlapping the Bedrock calls"""
+    try:
+        data = request.json
+        tasks = data.get('tasks') or []
+        questions = [_extract_question(task) for task in tasks]
+        if not questions:
+            return ojsonify({"responses": []}, 200)
+
+        # Each task in the batch costs one token; a batch the bucket can never
+        # hold is refused outright rather than charged a capped price
+        if len(questions) > BUCKET_CAPACITY:
+            return ojsonify({
+                "status": "error",
+                "message": f"batch of {len(questions)} tasks exceeds the limit of {int(BUCKET_CAPACITY)}"
+            }, 413)
+        if not _allow(data, len(questions)):
+            return ojsonify({"status": "error", "message": "rate limit exceeded"}, 429)
+
+        # boto3 releases the GIL while waiting on Bedrock, so threads overlap the calls
+        with ThreadPoolExecutor(max_workers=min(16, len(questions))) as ex:
+            futures = [ex.submit(_answer, question) for question in questions]
+
+        responses = []
+        for future in futures:
+            try:
+                responses.append({"response": future.result()})
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
+                responses.append({"status": "error", "message": str(e)})
+        return ojsonify({"responses": responses}, 200)
+    except Exception as e:
+        return ojsonify({"status": "error", "message": str(e)}, 500)
 
 @app.route('/health', methods=['GET'])
 def health():
-    return jsonify({
+    """Health check, reporting whether answers come from Bedrock or the mock table"""
+    # Report "lazy" until the first request has loaded the model, rather than loading it here
+    if get_model.cache_info().currsize == 0:
+        agent_type = "lazy"
+    else:
+        agent_type = "bedrock-nova" if get_model() is not None else "mock"
+    return ojsonify({
         "status": "healthy",
-        "agent_type": "bedrock-nova" if AGENT_READY else "mock"
-    }), 200
+        "agent_type": agent_type
+    })
 
 if __name__ == '__main__':
     print("\n" + "="*60)
     print("Mock SDK with Strands Bedrock Agent")
     print("="*60)
-    print(f"Agent status: {'READY' if AGENT_READY else 'MOCK MODE'}")
+    print("Agent status: loaded on first request")
     print("Starting on http://localhost:5000")
     print("="*60 + "\n")
-    app.run(host='localhost', port=5000)
\ No newline at end of file
+
+    # Serve from one multi-threaded process so rate-limit buckets stay shared
+    # and Bedrock-bound requests don't queue behind each other
+    threads = int(os.getenv("SDK_THREADS", "16"))
+    try:
+        from waitress import serve
+    except ImportError:
+        print("waitress not installed, falling back to the Flask dev server")
+        app.run(host='localhost', port=5000, threaded=True)
+    else:
+        serve(app, host='localhost', port=5000, threads=threads)
\ No newline at end of file
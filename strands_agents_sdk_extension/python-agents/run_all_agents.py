@@ -1,27 +1,26 @@
-
 """
-Run all agents sequentially and show combined results
+Run all agents concurrently in one process and show combined results
 """
 
-import subprocess
-import sys
-import time
+import aiohttp
+import asyncio
+
+from agents import agent_1, agent_2, agent_3
+
+
+AGENTS = {1: agent_1, 2: agent_2, 3: agent_3}
+AGENT_TIMEOUT = 30
 
 
-def run_agent(agent_number):
+async def run_agent(agent_number, agent, session):
     """Run a single agent"""
     print(f"\n{'='*60}")
     print(f"Running Agent {agent_number}...")
     print(f"{'='*60}\n")
     
     try:
-        result = subprocess.run(
-            [sys.executable, f"agents/agent_{agent_number}.py"],
-            capture_output=False,
-            timeout=30
-        )
-        return result.returncode == 0
-    except subprocess.TimeoutExpired:
+        return await asyncio.wait_for(agent.run(session), timeout=AGENT_TIMEOUT)
+    except asyncio.TimeoutError:
         print(f"Agent {agent_number} timed out")
         return False
     except Exception as e:
@@ -29,6 +28,16 @@ def run_agent(agent_number):
         return False
 
 
+async def _run():
+    # One interpreter and one connection pool shared by every agent
+    connector = aiohttp.TCPConnector(limit=30, keepalive_timeout=30)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        results = await asyncio.gather(
+            *(run_agent(n, agent, session) for n, agent in AGENTS.items())
+        )
+    return dict(zip(AGENTS, results))
+
+
 def main():
     print("\n" + "="*60)
     print("STRANDS AGENTS - MULTI-AGENT EXECUTION")
@@ -38,11 +47,9 @@ def main():
     
     results = {}
     
-    # Run agents sequentially
-    for agent_num in [1, 2, 3]:
-        success = run_agent(agent_num)
+    # Run agents concurrently
+    for agent_num, success in asyncio.run(_run()).items():
         results[f"Agent {agent_num}"] = "✓ Success" if success else "✗ Failed"
-        time.sleep(1)
     
     # Summary
     print("\n" + "="*60)
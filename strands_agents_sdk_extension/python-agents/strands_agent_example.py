@@ -8,8 +8,9 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+import asyncio
 import logging
-import time
+import aiohttp
 import requests
 from strands_client import StrandsAgentClient
 
@@ -30,29 +31,10 @@ class WrappedStrandsAgent:
         """Setup: Register, assign role, verify identity"""
         logger.info(f"\n[{self.agent_name}] Setting up agent...\n")
         
-        # Register
+        # Register with admin role, then verify
         try:
-            logger.info(f"[{self.agent_name}] Registering with wrapper...")
-            self.wrapper_client.register_agent()
-            time.sleep(0.5)
-        except Exception as e:
-            logger.error(f"Registration failed: {e}")
-            return False
-        
-        # Assign role
-        try:
-            logger.info(f"[{self.agent_name}] Assigning admin role...")
-            self.wrapper_client.assign_role("admin")
-            time.sleep(0.5)
-        except Exception as e:
-            logger.error(f"Role assignment failed: {e}")
-            return False
-        
-        # Verify - with longer timeout
-        try:
-            logger.info(f"[{self.agent_name}] Verifying identity...")
-            # Verify identity with wrapper
-            verify_result = self.wrapper_client.verify_with_wrapper()
+            logger.info(f"[{self.agent_name}] Bootstrapping with admin role...")
+            verify_result = self.wrapper_client.bootstrap("admin")
             
             if verify_result:
                 self.authenticated = True
@@ -62,10 +44,10 @@ class WrappedStrandsAgent:
                 logger.error("Verification failed")
                 return False
         except Exception as e:
-            logger.error(f"Verification error: {e}")
+            logger.error(f"Bootstrap failed: {e}")
             return False
         
-    def ask(self, question: str) -> str:
+    async def ask(self, session: aiohttp.ClientSession, question: str) -> str:
         """Ask the agent a question through the wrapper"""
         if not self.authenticated:
             logger.error(f"[{self.agent_name}] Not authenticated")
@@ -75,7 +57,7 @@ class WrappedStrandsAgent:
         
         try:
             # Execute task and get actual response
-            result = self.wrapper_client.execute_task({
+            result = await self.wrapper_client.aexecute_task(session, {
                 "question": question
             })
             # Extract the actual response from the mock SDK
@@ -88,6 +70,12 @@ class WrappedStrandsAgent:
             return f"Error processing question: {e}"
 
 
+async def _ask_all(agent: WrappedStrandsAgent, questions: list) -> list:
+    """Dispatch all questions concurrently over one pooled session"""
+    async with aiohttp.ClientSession() as session:
+        return await asyncio.gather(*(agent.ask(session, q) for q in questions))
+
+
 def main():
     """Example: Create and use a Strands agent with zero-trust wrapper"""
     
@@ -115,10 +103,10 @@ def main():
     
     logger.info(f"[{agent.agent_name}] Asking {len(questions)} questions...\n")
     
-    for question in questions:
-        response = agent.ask(question)
+    # Each question is an independent wrapper call, so they run concurrently
+    responses = asyncio.run(_ask_all(agent, questions))
+    for response in responses:
         logger.info(f"Response: {response}\n")
-        time.sleep(1)
     
     logger.info("="*70)
     logger.info("✓ Agent test completed successfully!")
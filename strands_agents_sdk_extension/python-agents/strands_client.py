@@ -1,8 +1,26 @@
 import requests
-import json
-from typing import Dict, Any, Optional
-from dataclasses import dataclass
-from cryptography.hazmat.primitives.asymmetric import ed25519
+import aiohttp
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import asyncio
+import base64
+import functools
+import orjson
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, field
+from nacl.signing import SigningKey
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Largest batch the wrapper (maxBatchTasks) and the Flask /execute_batch endpoint accept
+MAX_BATCH_TASKS = 20
 
 
 @dataclass
@@ -15,41 +33,187 @@ class AgentCredentials:
     created_at: int
     expires_at: int
     status: str
+    # Derived once from the fields above so verification skips the decode and seed expansion
+    _signing_key: Optional[SigningKey] = field(default=None, repr=False)
+    _nonce_bytes: Optional[bytes] = field(default=None, repr=False)
+    _verify_payload: Optional[Dict[str, str]] = field(default=None, repr=False)
+    # Ed25519 is deterministic, so the signature over a fixed nonce can be reused
+    _signature_b64: Optional[str] = field(default=None, repr=False)
+
+
+def _parse_credentials(data: Dict[str, Any]) -> AgentCredentials:
+    """Build credentials from a register/bootstrap response"""
+    credentials = AgentCredentials(
+        agent_id=data["agent_id"],
+        public_key_hex=data["public_key"],
+        private_key_hex=data["private_key"],
+        nonce=data["nonce"],
+        created_at=data["created_at"],
+        expires_at=data["expires_at"],
+        status=data["status"]
+    )
+    
+    # Ed25519 private key is 64 bytes (seed + public key)
+    # We only need the first 32 bytes (the seed)
+    private_key_bytes = bytes.fromhex(data["private_key"])
+    if len(private_key_bytes) in (32, 64):
+        credentials._signing_key = SigningKey(private_key_bytes[:32])
+    credentials._nonce_bytes = data["nonce"].encode("ascii")
+    # Everything in the verify request except the signature is fixed for these credentials
+    credentials._verify_payload = {"agent_id": data["agent_id"], "nonce": data["nonce"]}
+    return credentials
+
+
+def _sign_nonce(agent_id: str, credentials: AgentCredentials) -> Optional[str]:
+    """Base64 signature over the credentials' nonce, or None if signing is impossible"""
+    if credentials._signature_b64 is not None:
+        return credentials._signature_b64
+    
+    try:
+        signing_key = credentials._signing_key
+        if signing_key is None:
+            key_length = len(credentials.private_key_hex) // 2
+            print(f"[{agent_id}] ✗ Invalid private key length: {key_length}")
+            return None
+        
+        # Sign the nonce
+        signature = signing_key.sign(credentials._nonce_bytes).signature
+        # base64 is a third smaller on the wire than hex
+        credentials._signature_b64 = base64.b64encode(signature).decode("ascii")
+        return credentials._signature_b64
+    except Exception as e:
+        print(f"[{agent_id}] ✗ Sign failed: {e}")
+        return None
+
+
+def _align_results(results: List[Dict[str, Any]], count: int) -> List[Dict[str, Any]]:
+    """Pad a batch response so every submitted task has an entry"""
+    missing = {"status": "error", "message": "missing result"}
+    return list(results[:count]) + [missing] * (count - len(results))
+
+
+def _resolve(future, result: Dict[str, Any]) -> None:
+    """Complete a task's future from its batch entry (concurrent or asyncio future)"""
+    if future.done():
+        return
+    if result.get("status") == "error":
+        future.set_exception(RuntimeError(result.get("message", "task failed")))
+    else:
+        future.set_result(result)
+
+
+def _post_json(session: requests.Session, url: str, obj: Any, **kwargs) -> requests.Response:
+    """POST obj encoded with orjson; the session supplies the JSON content type"""
+    return session.post(url, data=orjson.dumps(obj), **kwargs)
+
+
+def wait_ready(wrapper_url: str, timeout: float = 5, interval: float = 0.02) -> bool:
+    """Poll the wrapper's /health until it answers 200 or timeout seconds pass"""
+    url = f"{wrapper_url.rstrip('/')}/health"
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if requests.get(url, timeout=0.5).status_code == 200:
+                return True
+        except requests.exceptions.RequestException:
+            pass
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
 
 
 class StrandsAgentClient:
     """Client for agents to communicate through Go wrapper"""
 
+    _sessions: Dict[str, requests.Session] = {}
+    _sessions_lock = threading.Lock()
+
     def __init__(self, agent_id: str, wrapper_url: str = "http://localhost:8080"):
         self.agent_id = agent_id
         self.wrapper_url = wrapper_url.rstrip("/")
         self.credentials: Optional[AgentCredentials] = None
-        self.session = requests.Session()
+        self.session = StrandsAgentClient._shared_session_for(self.wrapper_url)
+        
+        # The session is shared with other agents, so identity travels per request
+        self._headers = {"X-Agent-ID": agent_id}
+        
+        # Endpoints never change for a client
+        api = f"{self.wrapper_url}/api/v1"
+        self._ep_register = f"{api}/identity/register"
+        self._ep_bootstrap = f"{api}/identity/bootstrap"
+        self._ep_verify = f"{api}/identity/verify"
+        self._ep_verify_batch = f"{api}/identity/verify_batch"
+        self._ep_assign = f"{api}/policy/assign-role"
+        self._ep_execute = f"{api}/sdk/execute"
+        self._ep_execute_batch = f"{api}/sdk/execute/batch"
+        self._ep_execute_stream = f"{api}/sdk/execute/stream"
+        self._ep_stats = f"{api}/ratelimit/stats"
+        self._ep_anomalies = f"{api}/analytics/anomalies"
+
+    @classmethod
+    def _shared_session_for(cls, wrapper_url: str) -> requests.Session:
+        """One pooled session per wrapper URL, shared by every client talking to it"""
+        with cls._sessions_lock:
+            session = cls._sessions.get(wrapper_url)
+            if session is None:
+                session = requests.Session()
+                
+                # Keep connections to the wrapper alive across register/verify/execute calls
+                adapter = HTTPAdapter(
+                    pool_connections=32,
+                    pool_maxsize=256,
+                    max_retries=Retry(
+                        total=3,
+                        backoff_factor=0.1,
+                        status_forcelist=(502, 503, 504),
+                        allowed_methods=frozenset(["GET", "POST"])
+                    )
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers["Connection"] = "keep-alive"
+                session.headers["Content-Type"] = "application/json"
+                
+                # Every call shares one default timeout
+                session.request = functools.partial(session.request, timeout=60)
+                cls._sessions[wrapper_url] = session
+            return session
 
     def register_agent(self) -> AgentCredentials:
         """Register agent and get credentials"""
         print(f"[{self.agent_id}] Registering...")
         
-        endpoint = f"{self.wrapper_url}/api/v1/identity/register"
+        endpoint = self._ep_register
         payload = {"agent_id": self.agent_id}
         
-        response = self.session.post(endpoint, json=payload, timeout=30)
+        response = _post_json(self.session, endpoint, payload, headers=self._headers, timeout=30)
         response.raise_for_status()
         
-        data = response.json()
-        self.credentials = AgentCredentials(
-            agent_id=data["agent_id"],
-            public_key_hex=data["public_key"],
-            private_key_hex=data["private_key"],
-            nonce=data["nonce"],
-            created_at=data["created_at"],
-            expires_at=data["expires_at"],
-            status=data["status"]
-        )
+        self._store_credentials(orjson.loads(response.content))
         
         print(f"[{self.agent_id}] ✓ Registered successfully")
         return self.credentials
 
+    def bootstrap(self, role: str) -> bool:
+        """Register with a role in one call, then verify identity"""
+        print(f"[{self.agent_id}] Bootstrapping with role: {role}")
+        
+        endpoint = self._ep_bootstrap
+        payload = {"agent_id": self.agent_id, "role": role}
+        
+        response = _post_json(self.session, endpoint, payload, headers=self._headers, timeout=30)
+        response.raise_for_status()
+        
+        self._store_credentials(orjson.loads(response.content))
+        
+        print(f"[{self.agent_id}] ✓ Registered with role {role}")
+        # Verification proves possession of the private key, so it stays client-side
+        return self.verify_with_wrapper()
+
+    def _store_credentials(self, data: Dict[str, Any]) -> None:
+        """Keep the credentials returned by register/bootstrap"""
+        self.credentials = _parse_credentials(data)
+
     def verify_with_wrapper(self) -> bool:
         """Verify agent identity with wrapper"""
         if not self.credentials:
@@ -58,67 +222,64 @@ class StrandsAgentClient:
         
         print(f"[{self.agent_id}] Verifying...")
         
-        try:
-            # Convert hex string to bytes
-            private_key_bytes = bytes.fromhex(self.credentials.private_key_hex)
-            
-            # Ed25519 private key is 64 bytes (seed + public key)
-            # We only need the first 32 bytes (the seed)
-            if len(private_key_bytes) == 64:
-                # Full private key - use it directly
-                private_key = ed25519.Ed25519PrivateKey.from_private_bytes(private_key_bytes[:32])
-            elif len(private_key_bytes) == 32:
-                # Just the seed
-                private_key = ed25519.Ed25519PrivateKey.from_private_bytes(private_key_bytes)
-            else:
-                print(f"[{self.agent_id}] ✗ Invalid private key length: {len(private_key_bytes)}")
-                return False
-            
-            # Sign the nonce
-            signature = private_key.sign(self.credentials.nonce.encode())
-            signature_hex = signature.hex()
-        except Exception as e:
-            print(f"[{self.agent_id}] ✗ Sign failed: {e}")
+        signature_b64 = _sign_nonce(self.agent_id, self.credentials)
+        if signature_b64 is None:
             return False
         
-        endpoint = f"{self.wrapper_url}/api/v1/identity/verify"
-        payload = {
-            "agent_id": self.agent_id,
-            "signature": signature_hex,
-            "nonce": self.credentials.nonce
-        }
+        endpoint = self._ep_verify
+        payload = dict(self.credentials._verify_payload, signature_b64=signature_b64)
         
         try:
-            response = self.session.post(
-                endpoint,
-                json=payload,
-                headers={"X-Agent-ID": self.agent_id},
-                timeout=30
-            )
+            response = _post_json(self.session, endpoint, payload, headers=self._headers, timeout=30)
             response.raise_for_status()
             print(f"[{self.agent_id}] ✓ Verified successfully")
             return True
         except Exception as e:
+            # A 401 may mean the nonce rotated server-side; sign afresh next time
+            if isinstance(e, requests.exceptions.HTTPError) and e.response.status_code == 401:
+                self.credentials._signature_b64 = None
             print(f"[{self.agent_id}] ✗ Verification failed: {e}")
             return False
 
+    def verify_item(self) -> Optional[Tuple[str, str, str]]:
+        """This agent's (agent_id, nonce, signature_b64), for submission through bulk_verify"""
+        if not self.credentials:
+            return None
+        signature_b64 = _sign_nonce(self.agent_id, self.credentials)
+        if signature_b64 is None:
+            return None
+        return (self.credentials.agent_id, self.credentials.nonce, signature_b64)
+
+    def bulk_verify(self, items: List[Tuple[str, str, str]]) -> List[Dict[str, Any]]:
+        """Submit many (agent_id, nonce, signature_b64) verifications in one request
+
+        Returns one result per item, in order, each with a "status" of
+        "verification_queued" or "error".
+        """
+        endpoint = self._ep_verify_batch
+        payload = {
+            "items": [
+                {"agent_id": agent_id, "nonce": nonce, "signature_b64": signature_b64}
+                for agent_id, nonce, signature_b64 in items
+            ]
+        }
+        
+        response = _post_json(self.session, endpoint, payload, headers=self._headers, timeout=30)
+        response.raise_for_status()
+        return orjson.loads(response.content).get("results", [])
+
     def assign_role(self, role: str) -> bool:
         """Assign role to agent"""
         print(f"[{self.agent_id}] Assigning role: {role}")
         
-        endpoint = f"{self.wrapper_url}/api/v1/policy/assign-role"
+        endpoint = self._ep_assign
         payload = {
             "agent_id": self.agent_id,
             "role": role
         }
         
         try:
-            response = self.session.post(
-                endpoint,
-                json=payload,
-                headers={"X-Agent-ID": self.agent_id},
-                timeout=60
-            )
+            response = _post_json(self.session, endpoint, payload, headers=self._headers)
             response.raise_for_status()
             print(f"[{self.agent_id}] ✓ Role assigned")
             return True
@@ -128,18 +289,13 @@ class StrandsAgentClient:
 
     def execute_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Execute task through wrapper"""
-        endpoint = f"{self.wrapper_url}/api/v1/sdk/execute"
+        endpoint = self._ep_execute
         payload = {"task": task}
         
         try:
-            response = self.session.post(
-                endpoint,
-                json=payload,
-                headers={"X-Agent-ID": self.agent_id},
-                timeout=60
-            )
+            response = _post_json(self.session, endpoint, payload, headers=self._headers)
             response.raise_for_status()
-            result = response.json()
+            result = orjson.loads(response.content)
             return result
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 429:
@@ -150,35 +306,368 @@ class StrandsAgentClient:
                 print(f"[{self.agent_id}] ✗ Task failed: {e}")
             raise
 
+    def execute_tasks(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Execute several tasks through the wrapper in one request
+
+        Results come back in task order; a failed task yields an entry with
+        "status": "error" instead of failing the whole batch.
+        """
+        endpoint = self._ep_execute_batch
+        payload = {"tasks": tasks}
+        
+        try:
+            response = _post_json(self.session, endpoint, payload, headers=self._headers)
+            response.raise_for_status()
+            return _align_results(orjson.loads(response.content).get("results", []), len(tasks))
+        except requests.exceptions.HTTPError as e:
+            if e.response.status_code == 429:
+                print(f"[{self.agent_id}] ✗ Rate limit exceeded")
+            elif e.response.status_code == 403:
+                print(f"[{self.agent_id}] ✗ Authorization denied")
+            else:
+                print(f"[{self.agent_id}] ✗ Batch of {len(tasks)} failed: {e}")
+            raise
+
+    def execute_task_stream(self, task: Dict[str, Any]) -> Iterator[str]:
+        """Execute task through wrapper, yielding response text as it is generated"""
+        endpoint = self._ep_execute_stream
+        payload = {"task": task}
+        
+        try:
+            with _post_json(self.session, endpoint, payload, headers=self._headers, stream=True) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    event = orjson.loads(line)
+                    if "chunk" in event:
+                        yield event["chunk"]
+                    elif event.get("status") == "error":
+                        raise RuntimeError(event.get("message", "stream failed"))
+        except requests.exceptions.HTTPError as e:
+            if e.response.status_code == 429:
+                print(f"[{self.agent_id}] ✗ Rate limit exceeded")
+            elif e.response.status_code == 403:
+                print(f"[{self.agent_id}] ✗ Authorization denied")
+            else:
+                print(f"[{self.agent_id}] ✗ Task failed: {e}")
+            raise
+
+    async def aexecute_task(self, session: aiohttp.ClientSession, task: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute task through wrapper on a shared aiohttp session"""
+        endpoint = self._ep_execute
+        payload = {"task": task}
+        
+        try:
+            async with session.post(
+                endpoint,
+                data=orjson.dumps(payload),
+                headers={"X-Agent-ID": self.agent_id, "Content-Type": "application/json"},
+                timeout=aiohttp.ClientTimeout(total=60)
+            ) as response:
+                response.raise_for_status()
+                return await response.json(loads=orjson.loads)
+        except aiohttp.ClientResponseError as e:
+            if e.status == 429:
+                print(f"[{self.agent_id}] ✗ Rate limit exceeded")
+            elif e.status == 403:
+                print(f"[{self.agent_id}] ✗ Authorization denied")
+            else:
+                print(f"[{self.agent_id}] ✗ Task failed: {e}")
+            raise
+
     def get_rate_limit_stats(self) -> Dict[str, Any]:
         """Get rate limit stats"""
-        endpoint = f"{self.wrapper_url}/api/v1/ratelimit/stats"
+        endpoint = self._ep_stats
         
         try:
-            response = self.session.get(
-                endpoint,
-                headers={"X-Agent-ID": self.agent_id},
-                    timeout=60
-            )
+            response = self.session.get(endpoint, headers=self._headers)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except Exception as e:
             print(f"[{self.agent_id}] ✗ Failed to get stats: {e}")
             return {}
 
+    def iter_anomalies(self) -> Iterator[Dict[str, Any]]:
+        """Yield detected anomalies as they are parsed off the response stream"""
+        endpoint = self._ep_anomalies
+        
+        with self.session.get(endpoint, headers=self._headers, stream=True) as response:
+            response.raise_for_status()
+            if IJSON_AVAILABLE:
+                # Parse incrementally so callers start before the body has fully arrived
+                response.raw.decode_content = True
+                yield from ijson.items(response.raw, "anomalies.item", use_float=True)
+            else:
+                yield from orjson.loads(response.content).get("anomalies", [])
+
     def get_anomalies(self) -> list:
         """Get detected anomalies"""
-        endpoint = f"{self.wrapper_url}/api/v1/analytics/anomalies"
-        
         try:
-            response = self.session.get(
-                endpoint,
-                headers={"X-Agent-ID": self.agent_id},
-                    timeout=60
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("anomalies", [])
+            return list(self.iter_anomalies())
         except Exception as e:
             print(f"[{self.agent_id}] ✗ Failed to get anomalies: {e}")
-            return []
\ No newline at end of file
+            return []
+
+
+class AsyncStrandsAgentClient:
+    """Asyncio counterpart of StrandsAgentClient
+
+    Pass one aiohttp session to many clients so concurrent agent flows share
+    its keep-alive connection pool; otherwise the client opens its own.
+
+    With coalesce=True, execute_task calls made within max_wait seconds of
+    each other are sent as one batch request of up to max_batch tasks
+    (capped at MAX_BATCH_TASKS).
+    """
+
+    def __init__(self, agent_id: str, wrapper_url: str = "http://localhost:8080",
+                 session: Optional[aiohttp.ClientSession] = None,
+                 coalesce: bool = False, max_batch: int = MAX_BATCH_TASKS, max_wait: float = 0.005):
+        self.agent_id = agent_id
+        self.wrapper_url = wrapper_url.rstrip("/")
+        self.credentials: Optional[AgentCredentials] = None
+        self.session = session
+        self._owns_session = session is None
+        self.coalesce = coalesce
+        self.max_batch = min(max_batch, MAX_BATCH_TASKS)
+        self.max_wait = max_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._drainer: Optional[asyncio.Task] = None
+        # Tasks the drainer has taken off the queue for the batch it is still collecting
+        self._collecting: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._in_flight: set = set()
+
+    async def __aenter__(self) -> "AsyncStrandsAgentClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Flush coalesced tasks, stop coalescing and close the session if this client created it"""
+        if self._drainer is not None:
+            self._drainer.cancel()
+            try:
+                await self._drainer
+            except asyncio.CancelledError:
+                pass
+            # Tasks in the open batching window or still queued are sent, not dropped
+            pending = self._collecting
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            for i in range(0, len(pending), self.max_batch):
+                self._send_later(pending[i:i + self.max_batch])
+            self._drainer = None
+            self._queue = None
+            self._collecting = []
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def _post(self, path: str, payload: Dict[str, Any], timeout: int = 30) -> Dict[str, Any]:
+        """POST JSON to the wrapper and return the decoded response"""
+        if self.session is None:
+            # Sessions must be created inside a running event loop, so this is lazy
+            connector = aiohttp.TCPConnector(limit=100, keepalive_timeout=30)
+            self.session = aiohttp.ClientSession(connector=connector)
+        
+        async with self.session.post(
+            f"{self.wrapper_url}{path}",
+            data=orjson.dumps(payload),
+            headers={"X-Agent-ID": self.agent_id, "Content-Type": "application/json"},
+            timeout=aiohttp.ClientTimeout(total=timeout)
+        ) as response:
+            response.raise_for_status()
+            return await response.json(loads=orjson.loads)
+
+    async def register_agent(self) -> AgentCredentials:
+        """Register agent and get credentials"""
+        print(f"[{self.agent_id}] Registering...")
+        
+        data = await self._post("/api/v1/identity/register", {"agent_id": self.agent_id})
+        self.credentials = _parse_credentials(data)
+        
+        print(f"[{self.agent_id}] ✓ Registered successfully")
+        return self.credentials
+
+    async def bootstrap(self, role: str) -> bool:
+        """Register with a role in one call, then verify identity"""
+        print(f"[{self.agent_id}] Bootstrapping with role: {role}")
+        
+        data = await self._post("/api/v1/identity/bootstrap", {"agent_id": self.agent_id, "role": role})
+        self.credentials = _parse_credentials(data)
+        
+        print(f"[{self.agent_id}] ✓ Registered with role {role}")
+        return await self.verify_with_wrapper()
+
+    async def verify_with_wrapper(self) -> bool:
+        """Verify agent identity with wrapper"""
+        if not self.credentials:
+            print(f"[{self.agent_id}] ✗ No credentials")
+            return False
+        
+        print(f"[{self.agent_id}] Verifying...")
+        
+        signature_b64 = _sign_nonce(self.agent_id, self.credentials)
+        if signature_b64 is None:
+            return False
+        
+        payload = dict(self.credentials._verify_payload, signature_b64=signature_b64)
+        
+        try:
+            await self._post("/api/v1/identity/verify", payload)
+            print(f"[{self.agent_id}] ✓ Verified successfully")
+            return True
+        except Exception as e:
+            # A 401 may mean the nonce rotated server-side; sign afresh next time
+            if isinstance(e, aiohttp.ClientResponseError) and e.status == 401:
+                self.credentials._signature_b64 = None
+            print(f"[{self.agent_id}] ✗ Verification failed: {e}")
+            return False
+
+    async def assign_role(self, role: str) -> bool:
+        """Assign role to agent"""
+        print(f"[{self.agent_id}] Assigning role: {role}")
+        
+        payload = {
+            "agent_id": self.agent_id,
+            "role": role
+        }
+        
+        try:
+            await self._post("/api/v1/policy/assign-role", payload, timeout=60)
+            print(f"[{self.agent_id}] ✓ Role assigned")
+            return True
+        except Exception as e:
+            print(f"[{self.agent_id}] ✗ Role assignment failed: {e}")
+            return False
+
+    async def execute_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute task through wrapper"""
+        try:
+            if self.coalesce:
+                return await self._enqueue(task)
+            return await self._post("/api/v1/sdk/execute", {"task": task}, timeout=60)
+        except aiohttp.ClientResponseError as e:
+            if e.status == 429:
+                print(f"[{self.agent_id}] ✗ Rate limit exceeded")
+            elif e.status == 403:
+                print(f"[{self.agent_id}] ✗ Authorization denied")
+            else:
+                print(f"[{self.agent_id}] ✗ Task failed: {e}")
+            raise
+
+    async def execute_tasks(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Execute several tasks through the wrapper in one request"""
+        data = await self._post("/api/v1/sdk/execute/batch", {"tasks": tasks}, timeout=60)
+        return _align_results(data.get("results", []), len(tasks))
+
+    async def _enqueue(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """Hand a task to the coalescer and wait for its entry in the batch response"""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._drainer = asyncio.create_task(self._drain())
+        
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((task, future))
+        return await future
+
+    async def _drain(self) -> None:
+        """Collect queued tasks until max_batch or max_wait is hit, then send them"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = self._collecting = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Keep collecting the next batch while this one is in flight
+            self._collecting = []
+            self._send_later(batch)
+
+    def _send_later(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        """Start sending a batch in the background, tracked until it finishes"""
+        sender = asyncio.create_task(self._send_batch(batch))
+        self._in_flight.add(sender)
+        sender.add_done_callback(self._in_flight.discard)
+
+    async def _send_batch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        """Send one coalesced batch and resolve each task's future"""
+        try:
+            results = await self.execute_tasks([task for task, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), result in zip(batch, results):
+            _resolve(future, result)
+
+
+class BatchingClient:
+    """Coalesces tasks submitted in quick succession into one batch request"""
+
+    def __init__(self, client: StrandsAgentClient, window: float = 0.025, max_batch: int = 16):
+        self.client = client
+        self.window = window
+        self.max_batch = min(max_batch, MAX_BATCH_TASKS)
+        self._pending: List[Tuple[Dict[str, Any], Future]] = []
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def submit(self, task: Dict[str, Any]) -> Future:
+        """Queue a task; the future resolves to the same result execute_task returns"""
+        future = Future()
+        with self._lock:
+            self._pending.append((task, future))
+            if len(self._pending) >= self.max_batch:
+                batch = self._take()
+            else:
+                batch = None
+                # Arm the timer on the first task of a window
+                if self._timer is None:
+                    self._timer = threading.Timer(self.window, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+
+        if batch:
+            # Send full batches off the caller's thread so submit never blocks
+            threading.Thread(target=self._send, args=(batch,), daemon=True).start()
+        return future
+
+    def flush(self) -> None:
+        """Send everything queued so far"""
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self._send(batch)
+
+    def _take(self) -> List[Tuple[Dict[str, Any], Future]]:
+        """Detach the pending tasks and disarm the timer; caller holds the lock"""
+        batch, self._pending = self._pending, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+
+    def _send(self, batch: List[Tuple[Dict[str, Any], Future]]) -> None:
+        """POST one batch to the wrapper and resolve each task's future"""
+        try:
+            results = self.client.execute_tasks([task for task, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            _resolve(future, result)
@@ -1,9 +1,10 @@
 import requests
+import orjson
 
 print("Testing wrapper health...")
 try:
     response = requests.get("http://localhost:8443/health", timeout=5)
     print(f"Health check response: {response.status_code}")
-    print(f"Response: {response.json()}")
+    print(f"Response: {orjson.loads(response.content)}")
 except Exception as e:
     print(f"Health check failed: {e}")
\ No newline at end of file
@@ -1,13 +1,15 @@
 import requests
+import orjson
 
 print("Testing registration...")
 try:
     response = requests.post(
         "http://localhost:8443/api/v1/identity/register",
-        json={"agent_id": "test-minimal"},
+        data=orjson.dumps({"agent_id": "test-minimal"}),
+        headers={"Content-Type": "application/json"},
         timeout=30
     )
     print(f"Status: {response.status_code}")
-    print(f"Response: {response.json()}")
+    print(f"Response: {orjson.loads(response.content)}")
 except Exception as e:
     print(f"Registration failed: {e}")
\ No newline at end of file
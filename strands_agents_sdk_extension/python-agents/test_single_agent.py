@@ -2,71 +2,81 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from strands_client import StrandsAgentClient
-import time
-import json
+from strands_client import AsyncStrandsAgentClient, wait_ready
+import aiohttp
+import asyncio
 
 
-def main():
-    print("\n" + "="*60)
-    print("TESTING SINGLE AGENT")
-    print("="*60 + "\n")
-    
-    # Create client with longer timeout
-    client = StrandsAgentClient(
-        agent_id="test-agent-simple",
-        wrapper_url="http://localhost:8443"
-    )
-    client.session.timeout = 30  # Increase timeout
-    
+async def flow(client: AsyncStrandsAgentClient) -> bool:
+    """Register, assign role, verify and execute one task for a single agent"""
     # Register
-    print("[TEST] Step 1: Registering...")
+    print(f"[{client.agent_id}] Step 1: Registering...")
     try:
-        creds = client.register_agent()
-        print(f"[TEST] ✓ Registered\n")
+        await client.register_agent()
+        print(f"[{client.agent_id}] ✓ Registered\n")
     except Exception as e:
-        print(f"[TEST] ✗ Failed: {e}\n")
-        return
-    
-    time.sleep(1)
-    
+        print(f"[{client.agent_id}] ✗ Failed: {e}\n")
+        return False
+
     # Assign role
-    print("[TEST] Step 2: Assigning role...")
+    print(f"[{client.agent_id}] Step 2: Assigning role...")
     try:
-        client.assign_role("admin")
-        print(f"[TEST] ✓ Role assigned\n")
+        await client.assign_role("admin")
+        print(f"[{client.agent_id}] ✓ Role assigned\n")
     except Exception as e:
-        print(f"[TEST] ✗ Failed: {e}\n")
-        return
-    
-    time.sleep(1)
-    
+        print(f"[{client.agent_id}] ✗ Failed: {e}\n")
+        return False
+
     # Verify
-    print("[TEST] Step 3: Verifying...")
+    print(f"[{client.agent_id}] Step 3: Verifying...")
     try:
-        if client.verify_with_wrapper():
-            print(f"[TEST] ✓ Verified\n")
+        if await client.verify_with_wrapper():
+            print(f"[{client.agent_id}] ✓ Verified\n")
         else:
-            print(f"[TEST] ✗ Verification failed\n")
-            return
+            print(f"[{client.agent_id}] ✗ Verification failed\n")
+            return False
     except Exception as e:
-        print(f"[TEST] ✗ Failed: {e}\n")
-        return
-    
-    time.sleep(1)
-    
+        print(f"[{client.agent_id}] ✗ Failed: {e}\n")
+        return False
+
     # Execute task
-    print("[TEST] Step 4: Executing task...")
+    print(f"[{client.agent_id}] Step 4: Executing task...")
     try:
-        result = client.execute_task({"action": "test", "data": "hello"})
-        print(f"[TEST] ✓ Task executed\n")
+        result = await client.execute_task({"action": "test", "data": "hello"})
+        print(f"[{client.agent_id}] ✓ Task executed\n")
         print(f"Result: {result}\n")
     except Exception as e:
-        print(f"[TEST] ✗ Failed: {e}\n")
+        print(f"[{client.agent_id}] ✗ Failed: {e}\n")
+        return False
+
+    return True
+
+
+async def main(agent_count: int = 1):
+    print("\n" + "="*60)
+    print("TESTING SINGLE AGENT" if agent_count == 1 else f"TESTING {agent_count} AGENTS")
+    print("="*60 + "\n")
+
+    if not await asyncio.to_thread(wait_ready, "http://localhost:8443"):
+        print("[TEST] ✗ Wrapper not ready\n")
         return
-    
-    print("[TEST] ✓ All steps completed successfully!\n")
+
+    # All agents share one connection pool; their flows run concurrently
+    connector = aiohttp.TCPConnector(limit=100, keepalive_timeout=30)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        clients = [
+            AsyncStrandsAgentClient(
+                agent_id="test-agent-simple" if agent_count == 1 else f"test-agent-simple-{i}",
+                wrapper_url="http://localhost:8443",
+                session=session
+            )
+            for i in range(agent_count)
+        ]
+        results = await asyncio.gather(*(flow(c) for c in clients))
+
+    if all(results):
+        print("[TEST] ✓ All steps completed successfully!\n")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1))
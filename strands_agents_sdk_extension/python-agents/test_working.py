@@ -3,40 +3,42 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 import requests
-import json
+import orjson
 from cryptography.hazmat.primitives.asymmetric import ed25519
-import time
+from strands_client import wait_ready
 
-print("\n" + "="*60)
-print("WORKING AGENT TEST - Step by Step")
-print("="*60 + "\n")
+sys.stdout.write("\n" + "="*60 + "\nWORKING AGENT TEST - Step by Step\n" + "="*60 + "\n\n")
 
 wrapper_url = "http://localhost:8443"
 
+# Wait for the wrapper once; each step below is applied before its response returns
+if not wait_ready(wrapper_url):
+    print(f"✗ Wrapper not ready at {wrapper_url}\n")
+    exit(1)
+
 # Step 1: Register
 print("[1] Registering agent...")
 try:
     response = requests.post(
         f"{wrapper_url}/api/v1/identity/register",
-        json={"agent_id": "working-agent"},
+        data=orjson.dumps({"agent_id": "working-agent"}),
+        headers={"Content-Type": "application/json"},
         timeout=30
     )
     response.raise_for_status()
-    creds = response.json()
+    creds = orjson.loads(response.content)
     print(f"✓ Registered: {creds['agent_id']}\n")
 except Exception as e:
     print(f"✗ Failed: {e}\n")
     exit(1)
 
-time.sleep(1)
-
 # Step 2: Assign role (with longer timeout)
 print("[2] Assigning admin role...")
 try:
     response = requests.post(
         f"{wrapper_url}/api/v1/policy/assign-role",
-        json={"agent_id": "working-agent", "role": "admin"},
-        headers={"X-Agent-ID": "working-agent"},
+        data=orjson.dumps({"agent_id": "working-agent", "role": "admin"}),
+        headers={"X-Agent-ID": "working-agent", "Content-Type": "application/json"},
         timeout=30  # Longer timeout for middleware
     )
     response.raise_for_status()
@@ -45,8 +47,6 @@ except Exception as e:
     print(f"✗ Failed: {e}\n")
     exit(1)
 
-time.sleep(1)
-
 # Step 3: Verify identity
 print("[3] Verifying identity...")
 try:
@@ -57,12 +57,12 @@ try:
     
     response = requests.post(
         f"{wrapper_url}/api/v1/identity/verify",
-        json={
+        data=orjson.dumps({
             "agent_id": "working-agent",
             "signature": signature.hex(),
             "nonce": creds["nonce"]
-        },
-        headers={"X-Agent-ID": "working-agent"},
+        }),
+        headers={"X-Agent-ID": "working-agent", "Content-Type": "application/json"},
         timeout=30
     )
     response.raise_for_status()
@@ -71,8 +71,6 @@ except Exception as e:
     print(f"✗ Failed: {e}\n")
     exit(1)
 
-time.sleep(1)
-
 # Step 4: Check rate limit stats
 print("[4] Checking rate limit stats...")
 try:
@@ -82,28 +80,24 @@ try:
         timeout=30
     )
     response.raise_for_status()
-    stats = response.json()
+    stats = orjson.loads(response.content)
     print(f"✓ Available tokens: {stats.get('available')}/{stats.get('burst_size')}\n")
 except Exception as e:
     print(f"✗ Failed: {e}\n")
 
-time.sleep(1)
-
 # Step 5: Execute task
 print("[5] Executing task...")
 try:
     response = requests.post(
         f"{wrapper_url}/api/v1/sdk/execute",
-        json={"task": {"action": "test_action", "data": "test_data"}},
-        headers={"X-Agent-ID": "working-agent"},
+        data=orjson.dumps({"task": {"action": "test_action", "data": "test_data"}}),
+        headers={"X-Agent-ID": "working-agent", "Content-Type": "application/json"},
         timeout=30
     )
     response.raise_for_status()
-    result = response.json()
-    print(f"✓ Task executed: {json.dumps(result)}\n")
+    result = orjson.loads(response.content)
+    print(f"✓ Task executed: {orjson.dumps(result).decode()}\n")
 except Exception as e:
     print(f"✗ Failed: {e}\n")
 
-print("="*60)
-print("✓ ALL STEPS COMPLETED SUCCESSFULLY!")
-print("="*60 + "\n")
\ No newline at end of file
+sys.stdout.write("="*60 + "\n✓ ALL STEPS COMPLETED SUCCESSFULLY!\n" + "="*60 + "\n\n")
\ No newline at end of file
@@ -1,73 +1,131 @@
+import logging
 import os
+import sys
 import yaml
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from pathlib import Path
+from types import MappingProxyType
+from typing import ClassVar, Dict, Optional, Tuple
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Parsed rule files keyed by (path, mtime_ns), so reloading an unchanged file skips the parse
+_RULES_CACHE: Dict[Tuple[str, int], dict] = {}
+
+@lru_cache(maxsize=1)
+def _rules_path() -> Path:
+    """Location of threat_rules.yaml, resolved once"""
+    return Path(__file__).parent.parent / "config" / "threat_rules.yaml"
+
+
+def _refill(table, entries):
+    """Replace a lookup table's contents in place, interning the names it is keyed by"""
+    table.clear()
+    table.update((sys.intern(k) if isinstance(k, str) else k, v) for k, v in entries.items())
+
+
+@dataclass(frozen=True, slots=True)
 class Config:
+    """Settings snapshot; environment values are read once, at import
+
+    Use Config.from_env() for the shared instance and dataclasses.replace()
+    to derive an overridden copy. Threat rules are class-level and shared.
+    """
     # Wrapper Configuration
-    WRAPPER_HOST = os.getenv("WRAPPER_HOST", "localhost")
-    WRAPPER_PORT = os.getenv("WRAPPER_PORT", "8443")
-    WRAPPER_URL = f"http://{WRAPPER_HOST}:{WRAPPER_PORT}"
+    WRAPPER_HOST: str = os.getenv("WRAPPER_HOST", "localhost")
+    WRAPPER_PORT: str = os.getenv("WRAPPER_PORT", "8443")
+    WRAPPER_URL: str = f"http://{WRAPPER_HOST}:{WRAPPER_PORT}"
     
     # IDA Configuration
-    IDA_NAME = os.getenv("IDA_NAME", "intrusion-detection-agent-001")
-    IDA_ROLE = os.getenv("IDA_ROLE", "security_monitor")
+    IDA_NAME: str = os.getenv("IDA_NAME", "intrusion-detection-agent-001")
+    IDA_ROLE: str = os.getenv("IDA_ROLE", "security_monitor")
     
     # Bedrock Configuration
-    AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
-    AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
-    AWS_REGION = os.getenv("AWS_REGION", "us-east-2")
-    BEDROCK_MODEL = os.getenv("BEDROCK_MODEL", "us.amazon.nova-premier-v1:0")
+    AWS_ACCESS_KEY_ID: Optional[str] = os.getenv("AWS_ACCESS_KEY_ID")
+    AWS_SECRET_ACCESS_KEY: Optional[str] = os.getenv("AWS_SECRET_ACCESS_KEY")
+    AWS_REGION: str = os.getenv("AWS_REGION", "us-east-2")
+    BEDROCK_MODEL: str = os.getenv("BEDROCK_MODEL", "us.amazon.nova-premier-v1:0")
+    BEDROCK_MAX_POOL: int = int(os.getenv("BEDROCK_MAX_POOL", "100"))
+    BEDROCK_WORKERS: int = int(os.getenv("BEDROCK_WORKERS", str((os.cpu_count() or 1) * 5)))
+    # Lower scores get the rule-based analysis without a Bedrock call
+    BEDROCK_MIN_SCORE: int = int(os.getenv("BEDROCK_MIN_SCORE", "50"))
     
     # Threat Thresholds
-    THREAT_SCORE_LOW = 30
-    THREAT_SCORE_MEDIUM = 60
-    THREAT_SCORE_HIGH = 85
-    THREAT_SCORE_CRITICAL = 90
+    THREAT_SCORE_LOW: int = 30
+    THREAT_SCORE_MEDIUM: int = 60
+    THREAT_SCORE_HIGH: int = 85
+    THREAT_SCORE_CRITICAL: int = 90
     
     # Monitoring Configuration
-    MONITOR_INTERVAL = int(os.getenv("MONITOR_INTERVAL", "5"))
-    AUDIT_LOG_RETENTION = 24 * 60 * 60  # 24 hours in seconds
+    MONITOR_INTERVAL: int = int(os.getenv("MONITOR_INTERVAL", "5"))
+    AUDIT_LOG_RETENTION: int = 24 * 60 * 60  # 24 hours in seconds
     
     # Logging
-    LOG_FILE = os.getenv("LOG_FILE", "logs/ida.log")
-    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FILE: str = os.getenv("LOG_FILE", "logs/ida.log")
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     
     # SCADA Systems
-    OPENPLA_HOST = os.getenv("OPENPLA_HOST", "localhost")
-    OPENPLA_PORT = os.getenv("OPENPLA_PORT", "502")
-    SCADABR_HOST = os.getenv("SCADABR_HOST", "localhost")
-    SCADABR_PORT = os.getenv("SCADABR_PORT", "8180")
+    OPENPLA_HOST: str = os.getenv("OPENPLA_HOST", "localhost")
+    OPENPLA_PORT: str = os.getenv("OPENPLA_PORT", "502")
+    SCADABR_HOST: str = os.getenv("SCADABR_HOST", "localhost")
+    SCADABR_PORT: str = os.getenv("SCADABR_PORT", "8180")
     
     # Threat Rules - Load from YAML
-    THREAT_RULES = {}
-    THREAT_PATTERNS = {}
-    RESPONSE_ACTIONS = {}
-    SENSITIVITY = "medium"
-    BASELINE = {}
-    TIME_WINDOWS = {}
-    ALERTS = {}
+    # The lookup tables are refilled in place on reload, so the read-only
+    # views below (and the module-level getters bound to them) never go stale
+    THREAT_RULES: ClassVar[dict] = {}
+    THREAT_PATTERNS: ClassVar[dict] = {}
+    RESPONSE_ACTIONS: ClassVar[dict] = {}
+    SENSITIVITY: ClassVar[str] = "medium"
+    BASELINE: ClassVar[dict] = {}
+    TIME_WINDOWS: ClassVar[dict] = {}
+    ALERTS: ClassVar[dict] = {}
+    _THREAT_PATTERNS_MP: ClassVar[MappingProxyType] = MappingProxyType(THREAT_PATTERNS)
+    _RESPONSE_ACTIONS_MP: ClassVar[MappingProxyType] = MappingProxyType(RESPONSE_ACTIONS)
+    _BASELINE_MP: ClassVar[MappingProxyType] = MappingProxyType(BASELINE)
+    _TIME_WINDOWS_MP: ClassVar[MappingProxyType] = MappingProxyType(TIME_WINDOWS)
+    
+    @classmethod
+    @lru_cache(maxsize=1)
+    def from_env(cls) -> "Config":
+        """The shared configuration built from the environment"""
+        return cls()
+    
+    @property
+    def aws_clients(self) -> "AWSClients":
+        """AWS session and clients for this configuration, shared by equal configs"""
+        return _aws_clients(self)
     
     @classmethod
     def load_threat_rules(cls):
         """Load threat rules from YAML configuration file"""
-        rules_path = Path(__file__).parent.parent / "config" / "threat_rules.yaml"
+        rules_path = _rules_path()
         
-        if not rules_path.exists():
+        # One stat both checks the file exists and keys the parse cache
+        try:
+            mtime_ns = rules_path.stat().st_mtime_ns
+        except FileNotFoundError:
             raise FileNotFoundError(f"Threat rules file not found: {rules_path}")
         
         try:
-            with open(rules_path, 'r') as f:
-                rules = yaml.safe_load(f)
+            cache_key = (str(rules_path), mtime_ns)
+            rules = _RULES_CACHE.get(cache_key)
+            if rules is None:
+                with open(rules_path, 'r') as f:
+                    rules = yaml.load(f, Loader=_YAML_LOADER)
+                _RULES_CACHE[cache_key] = rules
             
             cls.THREAT_RULES = rules
-            cls.THREAT_PATTERNS = rules.get("threat_patterns", {})
-            cls.RESPONSE_ACTIONS = rules.get("response_actions", {})
+            _refill(cls.THREAT_PATTERNS, rules.get("threat_patterns", {}))
+            _refill(cls.RESPONSE_ACTIONS, rules.get("response_actions", {}))
             cls.SENSITIVITY = rules.get("sensitivity", {}).get("current_sensitivity", "medium")
-            cls.BASELINE = rules.get("baseline", {})
-            cls.TIME_WINDOWS = rules.get("time_windows", {})
+            _refill(cls.BASELINE, rules.get("baseline", {}))
+            _refill(cls.TIME_WINDOWS, rules.get("time_windows", {}))
             cls.ALERTS = rules.get("alerts", {})
             
             return True
@@ -76,31 +134,80 @@ class Config:
         except Exception as e:
             raise Exception(f"Error loading threat rules: {e}")
     
+    @classmethod
+    def initialize(cls):
+        """Load threat rules; entry points call this once before using them"""
+        try:
+            return cls.load_threat_rules()
+        except Exception as e:
+            logging.warning(f"Failed to load threat rules: {e}")
+            print(f"Warning: Threat rules not loaded. Make sure threat_rules.yaml exists in config/")
+            return False
+    
     @classmethod
     def get_threat_pattern(cls, pattern_name):
         """Get threat pattern by name"""
-        return cls.THREAT_PATTERNS.get(pattern_name)
+        return cls._THREAT_PATTERNS_MP.get(pattern_name)
     
     @classmethod
     def get_response_actions(cls, threat_level):
         """Get response actions for threat level"""
-        return cls.RESPONSE_ACTIONS.get(threat_level, {})
+        return cls._RESPONSE_ACTIONS_MP.get(threat_level, {})
     
     @classmethod
     def get_baseline_behavior(cls, behavior_type):
         """Get baseline behavior for comparison"""
-        return cls.BASELINE.get(behavior_type)
+        return cls._BASELINE_MP.get(behavior_type)
     
     @classmethod
     def get_time_window(cls, window_type):
         """Get time window in seconds"""
-        return cls.TIME_WINDOWS.get(window_type, 60)
+        return cls._TIME_WINDOWS_MP.get(window_type, 60)
+
+
+class AWSClients:
+    """boto3 session and clients for one Config, each built on first use"""
+    
+    def __init__(self, config: Config):
+        self.config = config
+    
+    @cached_property
+    def session(self):
+        import boto3
+        return boto3.Session(
+            aws_access_key_id=self.config.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=self.config.AWS_SECRET_ACCESS_KEY,
+            region_name=self.config.AWS_REGION
+        )
+    
+    @cached_property
+    def bedrock_client(self):
+        from botocore.config import Config as BotoConfig
+        # Used for availability probes, which should fail fast rather than hang
+        probe_config = BotoConfig(retries={"max_attempts": 2}, connect_timeout=2, read_timeout=3)
+        return self.session.client("bedrock", region_name=self.config.AWS_REGION, config=probe_config)
+    
+    @cached_property
+    def bedrock_runtime_config(self):
+        from botocore.config import Config as BotoConfig
+        # Model calls: a pool large enough for concurrent analyses, kept-alive connections
+        return BotoConfig(
+            max_pool_connections=self.config.BEDROCK_MAX_POOL,
+            tcp_keepalive=True,
+            retries={"max_attempts": 5, "mode": "adaptive"}
+        )
+    
+    @cached_property
+    def bedrock_models(self):
+        # BedrockModels on this session, keyed by (model_id, temperature)
+        return {}
+
+
+@lru_cache(maxsize=None)
+def _aws_clients(config: Config) -> AWSClients:
+    return AWSClients(config)
 
 
-# Load threat rules on module import
-try:
-    Config.load_threat_rules()
-except Exception as e:
-    import logging
-    logging.warning(f"Failed to load threat rules: {e}")
-    print(f"Warning: Threat rules not loaded. Make sure threat_rules.yaml exists in config/")
\ No newline at end of file
+# Direct lookups without the classmethod indirection, for hot paths
+get_threat_pattern = Config._THREAT_PATTERNS_MP.get
+get_baseline_behavior = Config._BASELINE_MP.get
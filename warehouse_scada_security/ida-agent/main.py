@@ -16,6 +16,7 @@ This will:
 import sys
 import os
 import argparse
+import dataclasses
 import logging
 import time
 from pathlib import Path
@@ -25,7 +26,6 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 # Import configuration and IDA agent
 from config import Config
-from core.ida import IntrusionDetectionAgent
 
 sys.stdout.reconfigure(encoding='utf-8')
 sys.stderr.reconfigure(encoding='utf-8')
@@ -91,9 +91,7 @@ Examples:
     return parser
 
 
-def print_banner():
-    """Print welcome banner"""
-    banner = """
+BANNER = """
     ╔══════════════════════════════════════════════════════════════╗
     ║                                                              ║
     ║     INTRUSION DETECTION AGENT (IDA) v1.0                   ║
@@ -105,32 +103,40 @@ def print_banner():
     ║                                                              ║
     ╚══════════════════════════════════════════════════════════════╝
     """
-    print(banner)
+
+
+def print_banner():
+    """Print welcome banner"""
+    sys.stdout.write(BANNER + "\n")
 
 
 def show_configuration(config: Config):
     """Display current configuration"""
-    print("\n" + "="*70)
-    print("IDA CONFIGURATION")
-    print("="*70)
-    print(f"Agent Name: {config.IDA_NAME}")
-    print(f"Agent Role: {config.IDA_ROLE}")
-    print(f"\nWrapper Configuration:")
-    print(f"  URL: {config.WRAPPER_URL}")
-    print(f"  Host: {config.WRAPPER_HOST}:{config.WRAPPER_PORT}")
-    print(f"\nBedrock Configuration:")
-    print(f"  Region: {config.AWS_REGION}")
-    print(f"  Model: {config.BEDROCK_MODEL}")
-    print(f"\nThreat Thresholds:")
-    print(f"  Low: < {config.THREAT_SCORE_LOW}")
-    print(f"  Medium: {config.THREAT_SCORE_LOW} - {config.THREAT_SCORE_MEDIUM}")
-    print(f"  High: {config.THREAT_SCORE_MEDIUM} - {config.THREAT_SCORE_HIGH}")
-    print(f"  Critical: >= {config.THREAT_SCORE_HIGH}")
-    print(f"\nMonitoring:")
-    print(f"  Interval: {config.MONITOR_INTERVAL}s")
-    print(f"  Log File: {config.LOG_FILE}")
-    print(f"  Log Level: {config.LOG_LEVEL}")
-    print("="*70 + "\n")
+    # Built as one block and written once rather than line by line
+    sys.stdout.write("\n".join([
+        "",
+        "="*70,
+        "IDA CONFIGURATION",
+        "="*70,
+        f"Agent Name: {config.IDA_NAME}",
+        f"Agent Role: {config.IDA_ROLE}",
+        "\nWrapper Configuration:",
+        f"  URL: {config.WRAPPER_URL}",
+        f"  Host: {config.WRAPPER_HOST}:{config.WRAPPER_PORT}",
+        "\nBedrock Configuration:",
+        f"  Region: {config.AWS_REGION}",
+        f"  Model: {config.BEDROCK_MODEL}",
+        "\nThreat Thresholds:",
+        f"  Low: < {config.THREAT_SCORE_LOW}",
+        f"  Medium: {config.THREAT_SCORE_LOW} - {config.THREAT_SCORE_MEDIUM}",
+        f"  High: {config.THREAT_SCORE_MEDIUM} - {config.THREAT_SCORE_HIGH}",
+        f"  Critical: >= {config.THREAT_SCORE_HIGH}",
+        "\nMonitoring:",
+        f"  Interval: {config.MONITOR_INTERVAL}s",
+        f"  Log File: {config.LOG_FILE}",
+        f"  Log Level: {config.LOG_LEVEL}",
+        "="*70 + "\n",
+    ]) + "\n")
 
 
 def test_wrapper_connection(config: Config) -> bool:
@@ -162,16 +168,8 @@ def test_bedrock_connection(config: Config) -> bool:
     print("\nTesting Bedrock connection...")
     
     try:
-        import boto3
-        session = boto3.Session(
-            aws_access_key_id=config.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY,
-            region_name=config.AWS_REGION
-        )
-        
         # Try to list available models
-        bedrock = session.client("bedrock", region_name=config.AWS_REGION)
-        models = bedrock.list_foundation_models()
+        models = config.aws_clients.bedrock_client.list_foundation_models()
         
         if models:
             print(f"✓ Bedrock is available in region {config.AWS_REGION}")
@@ -194,15 +192,18 @@ def main():
     print_banner()
     
     # Load configuration
-    config = Config()
+    config = Config.from_env()
     
     # Override config from command line
+    overrides = {}
     if args.debug:
-        config.LOG_LEVEL = "DEBUG"
+        overrides["LOG_LEVEL"] = "DEBUG"
     if args.wrapper_url:
-        config.WRAPPER_URL = args.wrapper_url
+        overrides["WRAPPER_URL"] = args.wrapper_url
     if args.monitor_interval:
-        config.MONITOR_INTERVAL = args.monitor_interval
+        overrides["MONITOR_INTERVAL"] = args.monitor_interval
+    if overrides:
+        config = dataclasses.replace(config, **overrides)
     
     # Show configuration if requested
     if args.show_config:
@@ -221,6 +222,9 @@ def main():
             print("\n⚠ Some systems unavailable (see above)")
             return 1
     
+    # Threat rules are only needed from here on, not for --show-config or --test-connection
+    Config.initialize()
+    
     # Show configuration
     show_configuration(config)
     
@@ -232,7 +236,8 @@ def main():
     # Test Bedrock connection
     test_bedrock_connection(config)
     
-    # Initialize IDA agent
+    # Initialize IDA agent; imported here so --show-config and --test-connection skip its dependencies
+    from core.ida import IntrusionDetectionAgent
     print("\nInitializing Intrusion Detection Agent...")
     ida = IntrusionDetectionAgent(config)
     
@@ -243,21 +248,26 @@ def main():
         return 1
     
     # Start monitoring
-    print("\n" + "="*70)
-    print("Starting continuous threat monitoring...")
-    print("="*70)
-    print("Press Ctrl+C to stop\n")
+    sys.stdout.write("\n".join([
+        "",
+        "="*70,
+        "Starting continuous threat monitoring...",
+        "="*70,
+        "Press Ctrl+C to stop\n",
+    ]) + "\n")
     
     try:
         ida.start_monitoring()
     except KeyboardInterrupt:
         print("\n\nShutting down IDA...")
-        ida.stop_monitoring()
     except Exception as e:
         print(f"\nFatal error: {e}")
         import traceback
         traceback.print_exc()
         return 1
+    finally:
+        # start_monitoring handles Ctrl+C itself, so stop (flush buffered LOW incidents) on every exit
+        ida.stop_monitoring()
     
     print("IDA shutdown complete")
     return 0
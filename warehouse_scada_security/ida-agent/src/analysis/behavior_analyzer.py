@@ -3,14 +3,37 @@ Behavior Analyzer - Detects anomalous operator behavior
 """
 
 from typing import Dict, List, Any
-from datetime import datetime, timedelta
 from collections import defaultdict
+from functools import lru_cache
 import logging
+import re
+
+from .log_fields import is_whitelisted_ip, log_ip
+
+
+class LogAggregate:
+    """Per-batch counts gathered by BehaviorAnalyzer.aggregate"""
+    __slots__ = ("failed_register", "execute_denied", "execute_denied_restricted",
+                 "role_rw", "ip_operators", "ip_operators_saturated", "execute_resources")
+    
+    def __init__(self):
+        self.failed_register = 0
+        self.execute_denied = 0
+        self.execute_denied_restricted = 0
+        self.role_rw = defaultdict(lambda: [0, 0])
+        self.ip_operators = defaultdict(set)
+        self.ip_operators_saturated = False
+        # Resource column of the EXECUTE logs, for ThreatAnalyzer.score_commands
+        self.execute_resources = []
 
 
 class BehaviorAnalyzer:
     """Analyzes operator behavior for anomalies"""
     
+    # Resource substrings that mark a read-only or an admin-only command
+    _read_re = re.compile(r"read|get|query|status")
+    _restricted_re = re.compile(r"emergency_shutdown|lock_account|register_device")
+    
     def __init__(self, config, logger: logging.Logger):
         self.config = config
         self.logger = logger
@@ -42,12 +65,17 @@ class BehaviorAnalyzer:
                 "credential_stuffing": 0
             }
         
+        # One pass over the logs; the scorers only apply thresholds
+        return self.score_aggregate(self.aggregate(audit_logs))
+    
+    def score_aggregate(self, agg: "LogAggregate") -> Dict[str, Any]:
+        """Behavior scores (as returned by analyze) from an aggregate"""
         # Analyze behavior signals
-        failed_login_score = self._analyze_failed_logins(audit_logs)
-        perm_denied_score = self._analyze_permission_denied(audit_logs)
-        priv_esc_score = self._analyze_privilege_escalation(audit_logs)
-        role_abuse_score = self._analyze_role_abuse(audit_logs)
-        cred_stuff_score = self._analyze_credential_stuffing(audit_logs)
+        failed_login_score = self._analyze_failed_logins(agg)
+        perm_denied_score = self._analyze_permission_denied(agg)
+        priv_esc_score = self._analyze_privilege_escalation(agg)
+        role_abuse_score = self._analyze_role_abuse(agg)
+        cred_stuff_score = self._analyze_credential_stuffing(agg)
         
         return {
             "failed_login_attempts": failed_login_score,
@@ -57,22 +85,69 @@ class BehaviorAnalyzer:
             "credential_stuffing": cred_stuff_score
         }
     
-    def _analyze_failed_logins(self, audit_logs: List[Dict]) -> int:
+    def aggregate(self, audit_logs: List[Dict]) -> LogAggregate:
+        """
+        Collect every count the scorers need in a single pass
+        
+        Privilege escalation and credential stuffing look at the last 100
+        logs and role abuse at the last 200, as before.
+        """
+        agg = LogAggregate()
+        n = len(audit_logs)
+        last_100 = n - 100
+        last_200 = n - 200
+        
+        for i, log in enumerate(audit_logs):
+            action = log.get("action", "")
+            result = log.get("result", "")
+            
+            if action == "REGISTER" and result == "failed":
+                agg.failed_register += 1
+            elif action == "EXECUTE":
+                resource = log.get("resource", "")
+                agg.execute_resources.append(resource)
+                if result == "denied":
+                    agg.execute_denied += 1
+                    if i >= last_100:
+                        if self._is_restricted_resource(resource):
+                            agg.execute_denied_restricted += 1
+                elif result == "success" and i >= last_200:
+                    # Index 0 counts reads, 1 writes
+                    is_read = self._is_read_resource(resource)
+                    agg.role_rw[log.get("operator_id", "")][0 if is_read else 1] += 1
+            
+            if i >= last_100 and not agg.ip_operators_saturated:
+                ip = log_ip(log)
+                operator = log.get("operator_id", "")
+                if ip and operator:
+                    operators = agg.ip_operators[ip]
+                    operators.add(operator)
+                    # Past 5 operators credential stuffing is already at its maximum score
+                    if len(operators) > 5:
+                        agg.ip_operators_saturated = True
+        
+        return agg
+    
+    # SCADA resources are a small set of devices and endpoints, so classifications are memoized
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _is_read_resource(resource: str) -> bool:
+        """Whether a resource names a read-only command"""
+        return BehaviorAnalyzer._read_re.search(resource.lower()) is not None
+    
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _is_restricted_resource(resource: str) -> bool:
+        """Whether a resource names an admin-only command"""
+        return BehaviorAnalyzer._restricted_re.search(resource.lower()) is not None
+    
+    def _analyze_failed_logins(self, agg: LogAggregate) -> int:
         """
         Detect brute force attacks - multiple failed login attempts
         Normal: 0-1 failed attempt per hour
         Attack: 5+ failed attempts in few minutes
         """
-        # Get failed logins from last hour
-        now = datetime.now()
-        one_hour_ago = now - timedelta(hours=1)
-        
-        failed_logins = [
-            log for log in audit_logs
-            if log.get("action") == "REGISTER" and log.get("result") == "failed"
-        ]
-        
-        failed_count = len(failed_logins)
+        failed_count = agg.failed_register
         
         # Score based on failed attempts
         if failed_count > 10:
@@ -84,18 +159,13 @@ class BehaviorAnalyzer:
         else:
             return 0
     
-    def _analyze_permission_denied(self, audit_logs: List[Dict]) -> int:
+    def _analyze_permission_denied(self, agg: LogAggregate) -> int:
         """
         Detect permission violation attempts
         Normal: 0-1 denied attempt per hour
         Attack: 5+ denied attempts (operator trying forbidden actions)
         """
-        perm_denied = [
-            log for log in audit_logs
-            if log.get("result") == "denied" and log.get("action") == "EXECUTE"
-        ]
-        
-        denied_count = len(perm_denied)
+        denied_count = agg.execute_denied
         
         if denied_count > 10:
             return 100
@@ -104,26 +174,13 @@ class BehaviorAnalyzer:
         else:
             return 0
     
-    def _analyze_privilege_escalation(self, audit_logs: List[Dict]) -> int:
+    def _analyze_privilege_escalation(self, agg: LogAggregate) -> int:
         """
         Detect privilege escalation attempts
         Example: viewer role trying to execute admin-only commands
         """
-        escalation_attempts = 0
-        
-        # Track operators and their attempted actions
-        operator_actions = defaultdict(list)
-        for log in audit_logs[-100:]:  # Last 100 logs
-            operator_id = log.get("operator_id", "")
-            action = log.get("action", "")
-            result = log.get("result", "")
-            resource = log.get("resource", "")
-            
-            if action == "EXECUTE" and result == "denied":
-                # Check if attempting restricted action
-                restricted_actions = ["emergency_shutdown", "lock_account", "register_device"]
-                if any(x in resource.lower() for x in restricted_actions):
-                    escalation_attempts += 1
+        # Denied restricted commands in the last 100 logs
+        escalation_attempts = agg.execute_denied_restricted
         
         if escalation_attempts > 5:
             return 100
@@ -132,33 +189,13 @@ class BehaviorAnalyzer:
         else:
             return 0
     
-    def _analyze_role_abuse(self, audit_logs: List[Dict]) -> int:
+    def _analyze_role_abuse(self, agg: LogAggregate) -> int:
         """
         Detect unauthorized use of role
         Example: Operator with 'viewer' role executing write commands
         """
-        role_abuse = 0
-        
-        # Track what roles execute what actions
-        role_action_map = defaultdict(lambda: {"read": 0, "write": 0})
-        
-        for log in audit_logs[-200:]:
-            operator_id = log.get("operator_id", "")
-            resource = log.get("resource", "").lower()
-            
-            if log.get("action") == "EXECUTE" and log.get("result") == "success":
-                if any(x in resource for x in ["read", "get", "query", "status"]):
-                    role_action_map[operator_id]["read"] += 1
-                else:
-                    role_action_map[operator_id]["write"] += 1
-        
-        # Check for anomalies
-        for operator, actions in role_action_map.items():
-            total = actions["read"] + actions["write"]
-            if total > 0:
-                write_ratio = actions["write"] / total
-                if write_ratio > 0.9:  # 90%+ write operations
-                    role_abuse += 1
+        # Operators with 90%+ write operations; every role_rw entry has at least one
+        role_abuse = sum(1 for reads, writes in agg.role_rw.values() if writes / (reads + writes) > 0.9)
         
         if role_abuse > 3:
             return 100
@@ -167,32 +204,20 @@ class BehaviorAnalyzer:
         else:
             return 0
     
-    def _analyze_credential_stuffing(self, audit_logs: List[Dict]) -> int:
+    def _analyze_credential_stuffing(self, agg: LogAggregate) -> int:
         """
         Detect credential stuffing attack
         Multiple different operators trying from same source in short time
         """
-        if not audit_logs:
-            return 0
-        
-        # Group by IP and count unique operators
-        ip_operators = defaultdict(set)
-        
-        for log in audit_logs[-100:]:
-            details = log.get("details", "")
-            ip = details.split("ip=")[-1] if "ip=" in details else None
-            operator = log.get("operator_id", "")
-            
-            if ip and operator:
-                ip_operators[ip].add(operator)
+        # Detect if one IP is trying multiple operator accounts; the worst IP decides
+        if agg.ip_operators_saturated:
+            return 100
         
-        # Detect if one IP is trying multiple operator accounts
-        for ip, operators in ip_operators.items():
-            if len(operators) > 5:
-                return 100
-            elif len(operators) > 3:
+        score = 0
+        for ip, operators in agg.ip_operators.items():
+            if len(operators) > 3:
                 return 70
-            elif len(operators) > 1 and "192.168" not in ip and "172.20" not in ip:
-                return 50
+            elif len(operators) > 1 and not is_whitelisted_ip(ip):
+                score = 50
         
-        return 0
\ No newline at end of file
+        return score
\ No newline at end of file
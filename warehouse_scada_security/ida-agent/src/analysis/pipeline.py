@@ -0,0 +1,41 @@
+"""
+Pipeline Analyzer - Runs every analyzer over one batch of audit logs
+"""
+
+from typing import Dict, List, Any
+
+from .threat_analyzer import ThreatAnalyzer
+from .behavior_analyzer import BehaviorAnalyzer
+
+
+class PipelineAnalyzer:
+    """
+    Produces all three signal sections ThreatScorer expects from one walk over the logs
+
+    BehaviorAnalyzer's aggregation pass also collects the EXECUTE resource
+    column, so the command-pattern checks reuse it instead of scanning the
+    logs again. The network checks only read the last 20-50 logs.
+    """
+
+    def __init__(self, threat_analyzer: ThreatAnalyzer, behavior_analyzer: BehaviorAnalyzer):
+        self.threat_analyzer = threat_analyzer
+        self.behavior_analyzer = behavior_analyzer
+
+    def analyze_all(self, audit_logs: List[Dict]) -> Dict[str, Any]:
+        """
+        Analyze a batch of audit logs
+
+        Returns:
+        {
+            "operator_behavior": {...},
+            "command_patterns": {...},
+            "network_activity": {...}
+        }
+        """
+        agg = self.behavior_analyzer.aggregate(audit_logs)
+
+        return {
+            "operator_behavior": self.behavior_analyzer.score_aggregate(agg),
+            "command_patterns": self.threat_analyzer.score_commands(agg.execute_resources),
+            "network_activity": self.threat_analyzer.analyze_network(audit_logs)
+        }
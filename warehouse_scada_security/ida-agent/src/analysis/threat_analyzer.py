@@ -3,14 +3,33 @@ Threat Analyzer - Detects suspicious patterns and threat signals
 """
 
 from typing import Dict, List, Any
-from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import Counter
+from itertools import islice
 import logging
+import re
+
+from .log_fields import is_whitelisted_ip, log_ip
+
+
+def _tail(audit_logs: List[Dict], n: int):
+    """Last n logs, newest first, without copying them into a new list"""
+    return islice(reversed(audit_logs), n)
 
 
 class ThreatAnalyzer:
     """Analyzes command patterns, network activity, and privilege escalation"""
     
+    # Resource substrings that mark a read-only command
+    _read_re = re.compile(r"read|get|query")
+    
+    # Result substrings that mark a protocol violation
+    _violation_re = re.compile(r"error|failed|invalid")
+    
+    # Up to this many commands, the frequency, device-switching and DoS
+    # checks cannot pass their thresholds (>100 commands, >10 devices,
+    # >20 repeats)
+    QUIET_COMMAND_COUNT = 10
+    
     def __init__(self, config, logger: logging.Logger):
         self.config = config
         self.logger = logger
@@ -39,11 +58,19 @@ class ThreatAnalyzer:
                 "dos_pattern": 0
             }
         
+        return self.score_commands(self._execute_resources(audit_logs))
+    
+    def score_commands(self, resources: List[str]) -> Dict[str, Any]:
+        """Command-pattern scores (as returned by analyze) from the EXECUTE resource column"""
         # Analyze command patterns
-        frequency_score = self._analyze_command_frequency(audit_logs)
-        type_shift_score = self._analyze_command_types(audit_logs)
-        device_switching_score = self._analyze_device_switching(audit_logs)
-        dos_score = self._analyze_dos_patterns(audit_logs)
+        type_shift_score = self._analyze_command_types(resources)
+        if len(resources) <= self.QUIET_COMMAND_COUNT:
+            # Quiet window, the common case: only the read/write mix can score
+            frequency_score = device_switching_score = dos_score = 0
+        else:
+            frequency_score = self._analyze_command_frequency(resources)
+            device_switching_score = self._analyze_device_switching(resources)
+            dos_score = self._analyze_dos_patterns(resources)
         
         return {
             "command_frequency_anomaly": frequency_score,
@@ -80,25 +107,22 @@ class ThreatAnalyzer:
             "protocol_violation": protocol_score
         }
     
-    def _analyze_command_frequency(self, audit_logs: List[Dict]) -> int:
+    def _execute_resources(self, audit_logs: List[Dict]) -> List[str]:
+        """
+        Resource column of the EXECUTE logs, in order
+        
+        Every command-pattern check works from this one list, so the logs
+        are scanned once per batch instead of once per check.
+        """
+        return [log.get("resource", "") for log in audit_logs if log.get("action") == "EXECUTE"]
+    
+    def _analyze_command_frequency(self, resources: List[str]) -> int:
         """
         Detect abnormal command frequency
         Normal: ~10 commands/hour
         Attack: 1000+ commands/hour
         """
-        if not audit_logs:
-            return 0
-        
-        # Count commands in last hour
-        now = datetime.now()
-        one_hour_ago = now - timedelta(hours=1)
-        
-        recent_commands = [
-            log for log in audit_logs
-            if log.get("action") == "EXECUTE"
-        ]
-        
-        command_count = len(recent_commands)
+        command_count = len(resources)
         
         # Score based on deviation from baseline
         if command_count > self.baseline_commands_per_hour * 100:
@@ -108,31 +132,21 @@ class ThreatAnalyzer:
         else:
             return 0
     
-    def _analyze_command_types(self, audit_logs: List[Dict]) -> int:
+    def _analyze_command_types(self, resources: List[str]) -> int:
         """
         Detect shift from READ to WRITE operations
         Normal: 80% read, 20% write
         Attack: sudden shift to 100% write (changing state)
         """
-        execute_logs = [log for log in audit_logs if log.get("action") == "EXECUTE"]
-        if not execute_logs:
+        if not resources:
             return 0
         
         # Categorize by command type
-        reads = []
-        writes = []
-        
-        for log in execute_logs:
-            resource = log.get("resource", "").lower()
-            if any(x in resource for x in ["read", "get", "query"]):
-                reads.append(log)
-            else:
-                writes.append(log)
-        
-        if len(reads) + len(writes) == 0:
-            return 0
+        read_search = self._read_re.search
+        reads = sum(1 for resource in resources if read_search(resource.lower()))
+        writes = len(resources) - reads
         
-        write_ratio = len(writes) / (len(reads) + len(writes))
+        write_ratio = writes / (reads + writes)
         
         # Score deviation from baseline
         baseline_write_ratio = 1 - self.baseline_read_write_ratio
@@ -140,22 +154,15 @@ class ThreatAnalyzer:
         
         return int(min(100, (deviation / baseline_write_ratio) * 100))
     
-    def _analyze_device_switching(self, audit_logs: List[Dict]) -> int:
+    def _analyze_device_switching(self, resources: List[str]) -> int:
         """
         Detect rapid switching between devices
         Normal: stable, ~2-3 devices per hour
         Attack: 20+ devices per hour (reconnaissance)
         """
-        execute_logs = [log for log in audit_logs if log.get("action") == "EXECUTE"]
-        if not execute_logs:
-            return 0
-        
         # Extract unique devices accessed
-        devices = set()
-        for log in execute_logs:
-            resource = log.get("resource", "")
-            if resource:
-                devices.add(resource)
+        devices = set(resources)
+        devices.discard("")
         
         device_count = len(devices)
         
@@ -166,28 +173,21 @@ class ThreatAnalyzer:
         else:
             return 0
     
-    def _analyze_dos_patterns(self, audit_logs: List[Dict]) -> int:
+    def _analyze_dos_patterns(self, resources: List[str]) -> int:
         """
         Detect DoS patterns - same command repeated rapidly
         """
-        if not audit_logs:
-            return 0
-        
-        # Group commands by type
-        command_counts = defaultdict(int)
-        for log in audit_logs:
-            if log.get("action") == "EXECUTE":
-                resource = log.get("resource", "")
-                command_counts[resource] += 1
+        # Group commands by type; only the most repeated one matters
+        top = Counter(resources).most_common(1)
+        peak = top[0][1] if top else 0
         
         # Check for command spam
-        for command, count in command_counts.items():
-            if count > 50:  # Same command 50+ times
-                return 100
-            elif count > 20:
-                return int((count / 50) * 100)
-        
-        return 0
+        if peak > 50:  # Same command 50+ times
+            return 100
+        elif peak > 20:
+            return int((peak / 50) * 100)
+        else:
+            return 0
     
     def _analyze_impossible_travel(self, audit_logs: List[Dict]) -> int:
         """
@@ -197,12 +197,10 @@ class ThreatAnalyzer:
         if not audit_logs:
             return 0
         
-        # Simplified: detect IP changes
-        ips = set()
-        for log in audit_logs[-20:]:  # Last 20 logs
-            ip = log.get("details", "").split("ip=")[-1] if "ip=" in log.get("details", "") else None
-            if ip:
-                ips.add(ip)
+        # Simplified: detect IP changes over the last 20 logs
+        ips = set(map(log_ip, _tail(audit_logs, 20)))
+        ips.discard(None)
+        ips.discard("")
         
         # Multiple IPs in short time = suspicious
         if len(ips) > 3:
@@ -216,16 +214,10 @@ class ThreatAnalyzer:
         """
         Detect requests from unauthorized IPs
         """
-        # Whitelist (would be in config)
-        whitelist = ["127.0.0.1", "192.168.1.0/24", "172.20.0.0/16"]
-        
-        unauthorized = 0
-        for log in audit_logs[-20:]:
-            ip = log.get("details", "").split("ip=")[-1] if "ip=" in log.get("details", "") else None
-            if ip and ip not in ["127.0.0.1", "localhost"]:
-                # Simple check - in production use IP range matching
-                if not any(x in ip for x in ["192.168", "172.20"]):
-                    unauthorized += 1
+        unauthorized = sum(
+            1 for ip in map(log_ip, _tail(audit_logs, 20))
+            if ip and not is_whitelisted_ip(ip)
+        )
         
         if unauthorized > 5:
             return 100
@@ -238,12 +230,11 @@ class ThreatAnalyzer:
         """
         Detect protocol violations and malformed requests
         """
-        violations = 0
-        
-        for log in audit_logs[-50:]:
-            result = log.get("result", "").lower()
-            if "error" in result or "failed" in result or "invalid" in result:
-                violations += 1
+        violation_search = self._violation_re.search
+        violations = sum(
+            1 for log in _tail(audit_logs, 50)
+            if violation_search(log.get("result", "").lower())
+        )
         
         if violations > 10:
             return 100
@@ -3,6 +3,10 @@ Threat Scorer - Calculates combined threat score from multiple signals
 """
 
 from typing import Dict, Any
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+import heapq
 import logging
 
 
@@ -17,6 +21,28 @@ class ThreatScorer:
     86-100: Critical threat - emergency shutdown
     """
     
+    # Signal names reported under each section of threat_data
+    SIGNAL_GROUPS = {
+        "operator_behavior": (
+            "failed_login_attempts",
+            "permission_denied_attempts",
+            "privilege_escalation",
+            "unauthorized_role_usage",
+            "credential_stuffing",
+        ),
+        "command_patterns": (
+            "command_frequency_anomaly",
+            "command_type_shift",
+            "rapid_device_switching",
+            "dos_pattern",
+        ),
+        "network_activity": (
+            "impossible_travel",
+            "unauthorized_ip",
+            "protocol_violation",
+        ),
+    }
+    
     def __init__(self, config, logger: logging.Logger):
         self.config = config
         self.logger = logger
@@ -41,6 +67,21 @@ class ThreatScorer:
             "unauthorized_ip": 0.03,
             "protocol_violation": 0.02,
         }
+        
+        # Signal names and weights in SIGNAL_GROUPS order, so scoring needs no weight lookups
+        self._signal_names = tuple(chain.from_iterable(self.SIGNAL_GROUPS.values()))
+        self._signal_weights = tuple(self.weights.get(name, 0) for name in self._signal_names)
+        
+        # Signal values are integer scores 0-100, so each signal's weighted
+        # contribution is a 101-entry table
+        self._contributions = tuple(
+            tuple((value / 100.0) * weight * 100 for value in range(101))
+            for weight in self._signal_weights
+        )
+        
+        # Monitoring mostly sees the same few signal vectors (often all zeros),
+        # so scores are memoized per vector for this scorer's weights
+        self._score_values = lru_cache(maxsize=4096)(self._score_values)
     
     def calculate_score(self, threat_data: Dict[str, Any]) -> int:
         """
@@ -52,49 +93,38 @@ class ThreatScorer:
                     "operator_behavior": {...},
                     "command_patterns": {...},
                     "network_activity": {...},
-                    "timestamp": ISO format timestamp
+                    "ts": epoch seconds (time.time())
                 }
         
         Returns:
             threat_score: 0-100 integer
         """
-        total_score = 0.0
-        
         # Extract signals
-        behavior = threat_data.get("operator_behavior", {})
-        commands = threat_data.get("command_patterns", {})
-        network = threat_data.get("network_activity", {})
+        values = []
+        for group, names in self.SIGNAL_GROUPS.items():
+            signals = threat_data.get(group, {})
+            values.extend([signals.get(name, 0) for name in names])
+        values = tuple(values)
         
-        # Calculate weighted score
-        signals = {
-            # Behavior signals
-            "failed_login_attempts": behavior.get("failed_login_attempts", 0),
-            "permission_denied_attempts": behavior.get("permission_denied_attempts", 0),
-            "privilege_escalation": behavior.get("privilege_escalation", 0),
-            "unauthorized_role_usage": behavior.get("unauthorized_role_usage", 0),
-            "credential_stuffing": behavior.get("credential_stuffing", 0),
-            
-            # Command patterns
-            "command_frequency_anomaly": commands.get("command_frequency_anomaly", 0),
-            "command_type_shift": commands.get("command_type_shift", 0),
-            "rapid_device_switching": commands.get("rapid_device_switching", 0),
-            "dos_pattern": commands.get("dos_pattern", 0),
-            
-            # Network activity
-            "impossible_travel": network.get("impossible_travel", 0),
-            "unauthorized_ip": network.get("unauthorized_ip", 0),
-            "protocol_violation": network.get("protocol_violation", 0),
-        }
+        # Log high-impact signals
+        if self.logger.isEnabledFor(logging.DEBUG):
+            for signal_name, weight, signal_value in zip(self._signal_names, self._signal_weights, values):
+                if signal_value > 50:
+                    self.logger.debug(f"Signal '{signal_name}' high: {signal_value} (weight: {weight})")
+        
+        return self._score_values(values)
+    
+    def _score_values(self, values: tuple) -> int:
+        """Weighted score for signal values given in SIGNAL_GROUPS order"""
+        total_score = 0.0
         
         # Apply weights
-        for signal_name, signal_value in signals.items():
-            weight = self.weights.get(signal_name, 0)
-            contribution = (signal_value / 100.0) * weight * 100  # Normalize and weight
+        for signal_value, weight, table in zip(values, self._signal_weights, self._contributions):
+            if type(signal_value) is int and 0 <= signal_value <= 100:
+                contribution = table[signal_value]
+            else:
+                contribution = (signal_value / 100.0) * weight * 100  # Normalize and weight
             total_score += contribution
-            
-            # Log high-impact signals
-            if signal_value > 50:
-                self.logger.debug(f"Signal '{signal_name}' high: {signal_value} (weight: {weight})")
         
         # Final score
         final_score = int(min(100, max(0, total_score)))
@@ -120,19 +150,12 @@ class ThreatScorer:
         commands = threat_data.get("command_patterns", {})
         network = threat_data.get("network_activity", {})
         
-        # Find top signals
-        top_signals = []
-        all_signals = {
-            **behavior,
-            **commands,
-            **network
-        }
-        
-        top_signals = sorted(
-            [(name, value) for name, value in all_signals.items()],
-            key=lambda x: x[1],
-            reverse=True
-        )[:3]
+        # Find top signals; the three groups never share a signal name
+        top_signals = heapq.nlargest(
+            3,
+            chain(behavior.items(), commands.items(), network.items()),
+            key=itemgetter(1)
+        )
         
         description = f"Threat Level: {level} (Score: {score}/100)\n"
         description += "Top Threat Indicators:\n"
@@ -4,24 +4,32 @@ Registers with Go Wrapper and continuously monitors for threats
 FIXED: Updated endpoints for actual Go Wrapper (/api/v1/...)
 """
 
+import atexit
+import binascii
 import logging
+import logging.handlers
+import queue
 import time
 import sys
 import os
+import threading
+from collections import deque
 from typing import Dict, Any
-from datetime import datetime
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from analysis.threat_analyzer import ThreatAnalyzer
 from analysis.behavior_analyzer import BehaviorAnalyzer
 from analysis.threat_scorer import ThreatScorer
+from analysis.pipeline import PipelineAnalyzer
 from reasoning.bedrock_reasoner import BedrockReasoner
 from execution.response_executor import ResponseExecutor
 
+import orjson
 import requests
-from cryptography.hazmat.primitives.asymmetric import ed25519
-from cryptography.hazmat.primitives import serialization
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from nacl.signing import SigningKey, VerifyKey
 
 
 class IntrusionDetectionAgent:
@@ -35,11 +43,28 @@ class IntrusionDetectionAgent:
         self.public_key = None
         self.private_key = None
         self.authenticated = False
+        # Signed audit_read headers; the message never changes, so it is signed once in setup()
+        self._audit_headers = None
+        # signed_post(url, message, payload); built in setup() once the keys are known
+        self.signed_post = None
+
+        # One keep-alive connection pool for every wrapper call (also used by ResponseExecutor)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.1)
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Bodies are pre-encoded with orjson and sent as data=
+        self.session.headers["Content-Type"] = "application/json"
 
         # Analysis modules
         self.threat_analyzer = ThreatAnalyzer(config, self.logger)
         self.behavior_analyzer = BehaviorAnalyzer(config, self.logger)
         self.threat_scorer = ThreatScorer(config, self.logger)
+        self.pipeline = PipelineAnalyzer(self.threat_analyzer, self.behavior_analyzer)
 
         # Reasoning module
         self.bedrock_reasoner = BedrockReasoner(config, self.logger)
@@ -49,8 +74,11 @@ class IntrusionDetectionAgent:
 
         # Monitoring state
         self.monitoring = False
+        # Set by stop_monitoring to wake the loop out of its interval wait
+        self._stop_evt = threading.Event()
         self.last_audit_check = 0
-        self.threat_history = []
+        # Oldest first, so expired entries are popped from the left
+        self.threat_history = deque()
 
         self.logger.info("="*70)
         self.logger.info("Intrusion Detection Agent Initialized")
@@ -60,7 +88,7 @@ class IntrusionDetectionAgent:
         logger = logging.getLogger("IDA")
         logger.setLevel(self.config.LOG_LEVEL)
 
-        os.makedirs(self.config.LOG_FILE.split('/')[0], exist_ok=True)
+        os.makedirs(os.path.dirname(self.config.LOG_FILE) or ".", exist_ok=True)
 
         fh = logging.FileHandler(self.config.LOG_FILE)
         fh.setLevel(self.config.LOG_LEVEL)
@@ -73,8 +101,15 @@ class IntrusionDetectionAgent:
         fh.setFormatter(formatter)
         ch.setFormatter(formatter)
 
-        logger.addHandler(fh)
-        logger.addHandler(ch)
+        # The monitor loop only enqueues records; a listener thread does the file/console writes
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        self._log_listener = logging.handlers.QueueListener(
+            log_queue, fh, ch, respect_handler_level=True
+        )
+        self._log_listener.start()
+        # Stopped at exit rather than in stop_monitoring(), so records logged afterwards still flush
+        atexit.register(self._log_listener.stop)
         return logger
 
     def setup(self) -> bool:
@@ -87,11 +122,10 @@ class IntrusionDetectionAgent:
             register_url = f"{self.wrapper_url}/api/v1/identity/register"
 
             payload = {"agent_id": self.agent_name}
-            registration_response = requests.post(register_url, json=payload, timeout=5)
+            registration_response = self.session.post(register_url, data=orjson.dumps(payload), timeout=5)
             registration_response.raise_for_status()
-            registration_data = registration_response.json()
+            registration_data = orjson.loads(registration_response.content)
             self.logger.info("Registered with Go Wrapper")
-            time.sleep(0.5)
         except Exception as e:
             self.logger.error(f"Registration failed: {e}")
             return False
@@ -108,12 +142,24 @@ class IntrusionDetectionAgent:
                 self.logger.error("Registration response missing required fields")
                 return False
             
-            # Reconstruct private key from hex
-            private_key_bytes = bytes.fromhex(private_key_hex)
-            self.private_key = ed25519.Ed25519PrivateKey.from_private_bytes(private_key_bytes[:32])
+            # Reconstruct keys from hex; a short key must fail here, not sign wrongly later
+            private_key_bytes = binascii.a2b_hex(private_key_hex)
+            public_key_bytes = binascii.a2b_hex(public_key_hex)
+            if len(private_key_bytes) < 32:
+                raise ValueError(f"private key is {len(private_key_bytes)} bytes, expected at least 32")
+            if len(public_key_bytes) != 32:
+                raise ValueError(f"public key is {len(public_key_bytes)} bytes, expected 32")
             
-            public_key_bytes = bytes.fromhex(public_key_hex)
-            self.public_key = ed25519.Ed25519PublicKey.from_public_bytes(public_key_bytes)
+            self.private_key = SigningKey(private_key_bytes[:32])
+            self.public_key = VerifyKey(public_key_bytes)
+            self.signed_post = self._make_signed_post()
+            
+            audit_signature = self.sign(f"{self.agent_name}:audit_read".encode())
+            self._audit_headers = {
+                "X-Agent-ID": self.agent_name,
+                "X-Signature": audit_signature.hex(),
+                "Content-Type": "application/json"
+            }
             
             self.logger.info("Credentials extracted")
         except Exception as e:
@@ -129,10 +175,11 @@ class IntrusionDetectionAgent:
                 "agent_id": self.agent_name,
                 "role": "admin"
             }
-            role_response = requests.post(assign_role_url, json=role_payload, timeout=5)
+            role_response = self._retry_not_ready(
+                lambda: self.session.post(assign_role_url, data=orjson.dumps(role_payload), timeout=5)
+            )
             role_response.raise_for_status()
             self.logger.info("Role assigned")
-            time.sleep(0.5)
         except Exception as e:
             self.logger.error(f"Role assignment failed: {e}")
             return False
@@ -143,7 +190,7 @@ class IntrusionDetectionAgent:
             
             # Sign with the wrapper's private key
             message = f"{self.agent_name}:{nonce}".encode()
-            signature = self.private_key.sign(message)
+            signature = self.sign(message)
             signature_hex = signature.hex()
             
             # FIXED: Use X-Agent-ID header and send agent_id + signature in body
@@ -162,11 +209,13 @@ class IntrusionDetectionAgent:
                 "nonce": nonce
             }
             
-            verify_response = requests.post(
-                verify_url, 
-                json=verify_payload, 
-                headers=headers, 
-                timeout=5
+            verify_response = self._retry_not_ready(
+                lambda: self.session.post(
+                    verify_url,
+                    data=orjson.dumps(verify_payload),
+                    headers=headers,
+                    timeout=5
+                )
             )
             verify_response.raise_for_status()
             
@@ -178,6 +227,43 @@ class IntrusionDetectionAgent:
             self.logger.error(f"Verification failed: {e}")
             return False
 
+    def sign(self, message: bytes) -> bytes:
+        """Raw 64-byte Ed25519 signature of message with the wrapper-issued key"""
+        return self.private_key.sign(message).signature
+
+    def _make_signed_post(self):
+        """
+        POST function specialized to this agent's name, key and session
+
+        The X-Agent-ID header and the bound sign method are captured once;
+        each call only adds the signature of message and sends payload as JSON.
+        """
+        session = self.session
+        key_sign = self.private_key.sign
+        header_template = {"X-Agent-ID": self.agent_name}
+
+        def signed_post(url: str, message: bytes, payload: Dict[str, Any], timeout: float = 5):
+            headers = header_template.copy()
+            headers["X-Signature"] = key_sign(message).signature.hex()
+            return session.post(url, data=orjson.dumps(payload), headers=headers, timeout=timeout)
+
+        return signed_post
+
+    # Statuses the wrapper may answer with while a just-written registration or role settles
+    NOT_READY_STATUSES = (404, 409, 425)
+
+    def _retry_not_ready(self, send, attempts: int = 5, base_delay: float = 0.05):
+        """
+        Send a setup request right away, backing off only while the wrapper reports "not ready"
+
+        Replaces fixed sleeps between setup steps; other responses are returned as-is.
+        """
+        for attempt in range(attempts):
+            response = send()
+            if response.status_code not in self.NOT_READY_STATUSES or attempt == attempts - 1:
+                return response
+            time.sleep(base_delay * (2 ** attempt))
+
     # --- Monitoring and threat handling remain unchanged ---
     def start_monitoring(self):
         if not self.authenticated:
@@ -185,6 +271,7 @@ class IntrusionDetectionAgent:
             return
 
         self.monitoring = True
+        self._stop_evt.clear()
         self.logger.info(f"\n{'='*70}")
         self.logger.info(f"IDA Starting Continuous Monitoring")
         self.logger.info(f"Monitoring interval: {self.config.MONITOR_INTERVAL}s")
@@ -196,8 +283,8 @@ class IntrusionDetectionAgent:
                 self._monitor_cycle()
                 elapsed = time.time() - cycle_start
                 sleep_time = max(0, self.config.MONITOR_INTERVAL - elapsed)
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
+                if self._stop_evt.wait(sleep_time):
+                    break
 
         except KeyboardInterrupt:
             self.logger.info("\nMonitoring stopped by user")
@@ -207,41 +294,37 @@ class IntrusionDetectionAgent:
             self.monitoring = False
 
     def _monitor_cycle(self):
+        # A lone LOW incident must not wait for another one to be flushed
+        self.response_executor.flush_low_incidents_if_due()
         audit_logs = self._fetch_audit_logs()
         if not audit_logs:
             return
-        threat_signals = self.threat_analyzer.analyze(audit_logs)
-        behavior_signals = self.behavior_analyzer.analyze(audit_logs)
-        network_signals = self.threat_analyzer.analyze_network(audit_logs)
-
+        # Epoch seconds; format with datetime.fromtimestamp only where a reader needs it
+        now = time.time()
         threat_data = {
-            "operator_behavior": behavior_signals,
-            "command_patterns": threat_signals,
-            "network_activity": network_signals,
-            "timestamp": datetime.now().isoformat(),
+            **self.pipeline.analyze_all(audit_logs),
+            "ts": now,
             "audit_log_count": len(audit_logs)
         }
         threat_score = self.threat_scorer.calculate_score(threat_data)
 
         self.logger.info(f"Threat Assessment: Score={threat_score}/100")
         for key, value in threat_data.items():
-            if key != "timestamp":
+            if key != "ts":
                 self.logger.debug(f"  {key}: {value}")
 
         if threat_score >= self.config.THREAT_SCORE_LOW:
             self._handle_threat(threat_score, threat_data, audit_logs)
 
         self.threat_history.append({
-            "timestamp": datetime.now().isoformat(),
+            "ts": now,
             "score": threat_score,
             "data": threat_data
         })
 
-        cutoff_time = time.time() - self.config.AUDIT_LOG_RETENTION
-        self.threat_history = [
-            h for h in self.threat_history
-            if datetime.fromisoformat(h["timestamp"]).timestamp() > cutoff_time
-        ]
+        cutoff_time = now - self.config.AUDIT_LOG_RETENTION
+        while self.threat_history and self.threat_history[0]["ts"] <= cutoff_time:
+            self.threat_history.popleft()
 
     def _fetch_audit_logs(self) -> list:
         """
@@ -256,21 +339,14 @@ class IntrusionDetectionAgent:
         # Fetch real events from wrapper
         real_events = []
         try:
-            message = f"{self.agent_name}:audit_read".encode()
-            signature = self.private_key.sign(message)
-            signature_hex = signature.hex()
-            
-            headers = {
-                "X-Agent-ID": self.agent_name,
-                "X-Signature": signature_hex,
-                "Content-Type": "application/json"
-            }
+            if self._audit_headers is None:
+                raise RuntimeError("no credentials yet, call setup() first")
             
             audit_url = f"{self.wrapper_url}/api/v1/audit/logs"
-            response = requests.get(audit_url, headers=headers, timeout=5)
+            response = self.session.get(audit_url, headers=self._audit_headers, timeout=5)
             response.raise_for_status()
             
-            data = response.json()
+            data = orjson.loads(response.content)
             real_events = data.get("events", [])
             
             self.logger.debug(f"Fetched {len(real_events)} real audit events from wrapper")
@@ -289,7 +365,7 @@ class IntrusionDetectionAgent:
                 mock_events = get_test_scenario(test_scenario)
                 
                 # Combine with real events
-                all_events = inject_test_events(real_events, test_scenario)
+                all_events = inject_test_events(real_events, test_scenario, mock_events)
                 
                 self.logger.info(f"Injected {len(mock_events)} mock events ({test_scenario})")
                 self.logger.info(f"Total events for analysis: {len(all_events)} (real: {len(real_events)}, mock: {len(mock_events)})")
@@ -331,6 +407,9 @@ class IntrusionDetectionAgent:
     def stop_monitoring(self):
         self.logger.info("Stopping IDA monitoring...")
         self.monitoring = False
+        self._stop_evt.set()
+        self.response_executor.flush_low_incidents()
+        self.session.close()
 
     def get_status(self) -> Dict[str, Any]:
         return {
@@ -4,52 +4,61 @@ Allows IDA to detect threats without needing real wrapper audit logs
 """
 
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+
+# Per-event strings never change between calls, so they are formatted once here;
+# the generators only fill in timestamps and build fresh dicts (analyzers annotate them)
+_BRUTE_FORCE_OPERATORS = tuple(f"attacker_attempt_{i}" for i in range(20))
+_BRUTE_FORCE_DETAILS = tuple(f"Failed authentication attempt {i+1} from 192.168.1.100" for i in range(20))
+_CRED_STUFF_OPERATORS = ("user1", "user2", "user3", "user4", "user5")
+_CRED_STUFF_IDS = tuple(f"evt_test_cred_stuff_{i}" for i in range(len(_CRED_STUFF_OPERATORS)))
+_ADMIN_COMMANDS = ("emergency_shutdown", "lock_account", "register_device")
+_PRIV_ESC_IDS = tuple(f"evt_test_priv_esc_{i}" for i in range(len(_ADMIN_COMMANDS)))
+_DOS_IDS = tuple(f"evt_test_dos_{i}" for i in range(20))
 
 
 def generate_brute_force_events() -> List[Dict[str, Any]]:
     """Generate mock brute force attack events - AGGRESSIVE"""
-    events = []
     base_time = int(datetime.now().timestamp())
     
     # Simulate 20 failed login attempts in rapid succession - strong signal
-    for i in range(20):
-        event = {
+    events = [
+        {
             "timestamp": base_time - (20-i)*2,  # 2 seconds apart
-            "operator_id": f"attacker_attempt_{i}",
+            "operator_id": _BRUTE_FORCE_OPERATORS[i],
             "action": "REGISTER",
             "resource": "agent_registration",
             "result": "failed",
-            "details": f"Failed authentication attempt {i+1} from 192.168.1.100"
+            "details": _BRUTE_FORCE_DETAILS[i]
         }
-        events.append(event)
+        for i in range(20)
+    ]
     
     # Add 10 permission denied events from same attacker
-    for i in range(10):
-        event = {
+    events.extend(
+        {
             "timestamp": base_time - (10-i)*3,
             "operator_id": "attacker_main",
             "action": "EXECUTE",
             "resource": "emergency_shutdown",
             "result": "denied",
-            "details": f"Permission denied: viewer role cannot execute admin command"
+            "details": "Permission denied: viewer role cannot execute admin command"
         }
-        events.append(event)
+        for i in range(10)
+    )
     
     return events
 
 
 def generate_credential_stuffing_events() -> List[Dict[str, Any]]:
     """Generate mock credential stuffing attack events"""
-    events = []
     base_time = int(datetime.now().timestamp())
     
     # Simulate multiple operators from same IP in short time
-    operators = ["user1", "user2", "user3", "user4", "user5"]
-    
-    for i, operator in enumerate(operators):
-        event = {
-            "event_id": f"evt_test_cred_stuff_{i}",
+    return [
+        {
+            "event_id": _CRED_STUFF_IDS[i],
             "timestamp": base_time - (5-i)*10,
             "event_type": "REGISTER",
             "agent_id": operator,
@@ -61,22 +70,18 @@ def generate_credential_stuffing_events() -> List[Dict[str, Any]]:
                 "error": "Invalid credentials"
             }
         }
-        events.append(event)
-    
-    return events
+        for i, operator in enumerate(_CRED_STUFF_OPERATORS)
+    ]
 
 
 def generate_privilege_escalation_events() -> List[Dict[str, Any]]:
     """Generate mock privilege escalation attack events"""
-    events = []
     base_time = int(datetime.now().timestamp())
     
     # Simulate viewer trying to execute admin commands
-    admin_commands = ["emergency_shutdown", "lock_account", "register_device"]
-    
-    for i, command in enumerate(admin_commands):
-        event = {
-            "event_id": f"evt_test_priv_esc_{i}",
+    return [
+        {
+            "event_id": _PRIV_ESC_IDS[i],
             "timestamp": base_time - (3-i)*5,
             "event_type": "EXECUTE",
             "agent_id": "viewer_user_123",
@@ -89,20 +94,18 @@ def generate_privilege_escalation_events() -> List[Dict[str, Any]]:
                 "error": "Insufficient permissions"
             }
         }
-        events.append(event)
-    
-    return events
+        for i, command in enumerate(_ADMIN_COMMANDS)
+    ]
 
 
 def generate_dos_events() -> List[Dict[str, Any]]:
     """Generate mock DoS/rate abuse attack events"""
-    events = []
     base_time = int(datetime.now().timestamp())
     
     # Simulate 20 rapid requests from one agent
-    for i in range(20):
-        event = {
-            "event_id": f"evt_test_dos_{i}",
+    return [
+        {
+            "event_id": _DOS_IDS[i],
             "timestamp": base_time - (20-i),  # 1 second apart
             "event_type": "EXECUTE",
             "agent_id": "bot_agent_999",
@@ -114,9 +117,8 @@ def generate_dos_events() -> List[Dict[str, Any]]:
                 "request_number": i + 1
             }
         }
-        events.append(event)
-    
-    return events
+        for i in range(20)
+    ]
 
 
 def get_test_scenario(scenario_name: str) -> List[Dict[str, Any]]:
@@ -143,18 +145,24 @@ def get_test_scenario(scenario_name: str) -> List[Dict[str, Any]]:
     return scenarios[scenario_name]()
 
 
-def inject_test_events(real_events: List[Dict], scenario: str = "brute_force") -> List[Dict]:
+def inject_test_events(
+    real_events: List[Dict],
+    scenario: str = "brute_force",
+    mock_events: Optional[List[Dict]] = None
+) -> List[Dict]:
     """
     Inject mock events into real events for testing
     
     Args:
         real_events: List of real audit events from wrapper
         scenario: Test scenario to inject
+        mock_events: Events already generated for the scenario, if the caller has them
     
     Returns:
         Combined list of real + mock events
     """
-    mock_events = get_test_scenario(scenario)
+    if mock_events is None:
+        mock_events = get_test_scenario(scenario)
     return real_events + mock_events if real_events else mock_events
 
 
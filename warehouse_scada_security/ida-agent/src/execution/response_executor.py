@@ -3,10 +3,24 @@ Response Executor - Executes security responses through Go Wrapper
 FIXED: Uses correct X-Agent-ID header and /api/v1/sdk/execute endpoint
 """
 
-from typing import Dict, Any
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 import logging
-import requests
-import json
+import orjson
+import re
+import time
+
+
+# Keywords in Bedrock's reasoning that point at a suspect operator, device or IP
+_REASONING_KEYWORDS = re.compile(r"operator|device|impossible travel|ip")
+
+
+@lru_cache(maxsize=32)
+def _reasoning_keywords(reasoning: str) -> frozenset:
+    """Keywords found in a reasoning text, from one lowercase + scan per distinct text"""
+    return frozenset(_REASONING_KEYWORDS.findall(reasoning.lower()))
 
 
 class ResponseExecutor:
@@ -15,10 +29,61 @@ class ResponseExecutor:
     All actions signed with Ed25519 and authenticated via middleware
     """
     
+    # Recommendation keyword -> builder of its (action, params), per urgency.
+    # Keywords are tried in order and the first one found in a recommendation wins.
+    CRITICAL_DISPATCH = {
+        "EMERGENCY_SHUTDOWN": lambda ex, analysis: ("emergency_shutdown", {}),
+        "LOCK_ALL_ACCOUNTS": lambda ex, analysis: ("lock_all_accounts", {}),
+        "ISOLATE_NETWORK": lambda ex, analysis: ("isolate_network_segment", {"segment": "all"}),
+        "ALERT_SECURITY": lambda ex, analysis: ex._prepare_alert("CRITICAL", analysis),
+    }
+    
+    HIGH_DISPATCH = {
+        "LOCK_SUSPECT": lambda ex, analysis: ("lock_operator_account", {
+            "operator_id": ex._get_suspect_operator(analysis)
+        }),
+        "LOCK_ACCOUNT": lambda ex, analysis: ("lock_operator_account", {
+            "operator_id": ex._get_suspect_operator(analysis)
+        }),
+        "REVOKE_SESSION": lambda ex, analysis: ("revoke_operator_session", {
+            "operator_id": ex._get_suspect_operator(analysis)
+        }),
+        "ISOLATE_DEVICE": lambda ex, analysis: ("isolate_device", {
+            "device_id": ex._get_suspect_device(analysis)
+        }),
+        "BLOCK_IP": lambda ex, analysis: ("block_ip", {
+            "ip_address": ex._get_malicious_ip(analysis)
+        }),
+        "ALERT": lambda ex, analysis: ex._prepare_alert("HIGH", analysis),
+    }
+    
+    MEDIUM_DISPATCH = {
+        "MONITOR": lambda ex, analysis: ("enable_monitoring", {
+            "operator_id": ex._get_suspect_operator(analysis)
+        }),
+        "RATE_LIMIT": lambda ex, analysis: ("rate_limit_operator", {
+            "operator_id": ex._get_suspect_operator(analysis),
+            "limit": "10_requests_per_minute"
+        }),
+        "REQUIRE_MFA": lambda ex, analysis: ("require_mfa", {
+            "operator_id": ex._get_suspect_operator(analysis)
+        }),
+        "ALERT": lambda ex, analysis: ex._prepare_alert("MEDIUM", analysis),
+    }
+    
+    # LOW incidents are sent to the wrapper in batches of this many, or
+    # once the oldest unsent one is this many seconds old
+    LOW_INCIDENT_BATCH = 32
+    LOW_INCIDENT_FLUSH_SECONDS = 30
+    
     def __init__(self, config, logger: logging.Logger, ida_agent):
         self.config = config
         self.logger = logger
         self.ida_agent = ida_agent
+        
+        # Unsent LOW incidents; bounded in case the wrapper stays unreachable
+        self._low_incident_buffer = deque(maxlen=256)
+        self._last_low_flush = time.time()
     
     def execute_response(
         self,
@@ -59,15 +124,7 @@ class ResponseExecutor:
         self._log_incident(threat_score, bedrock_analysis, "CRITICAL")
         
         # Execute critical actions
-        for action in recommendations:
-            if "EMERGENCY_SHUTDOWN" in action:
-                self._execute_action("emergency_shutdown", {})
-            elif "LOCK_ALL_ACCOUNTS" in action:
-                self._execute_action("lock_all_accounts", {})
-            elif "ISOLATE_NETWORK" in action:
-                self._execute_action("isolate_network_segment", {"segment": "all"})
-            elif "ALERT_SECURITY" in action:
-                self._send_alert("CRITICAL", bedrock_analysis)
+        self._execute_actions(self._match_actions(self.CRITICAL_DISPATCH, recommendations, bedrock_analysis))
     
     def _execute_high_response(
         self,
@@ -82,25 +139,7 @@ class ResponseExecutor:
         self._log_incident(threat_score, bedrock_analysis, "HIGH")
         
         # Execute high-level actions
-        for action in recommendations:
-            if "LOCK_SUSPECT" in action or "LOCK_ACCOUNT" in action:
-                self._execute_action("lock_operator_account", {
-                    "operator_id": self._get_suspect_operator(bedrock_analysis)
-                })
-            elif "REVOKE_SESSION" in action:
-                self._execute_action("revoke_operator_session", {
-                    "operator_id": self._get_suspect_operator(bedrock_analysis)
-                })
-            elif "ISOLATE_DEVICE" in action:
-                self._execute_action("isolate_device", {
-                    "device_id": self._get_suspect_device(bedrock_analysis)
-                })
-            elif "BLOCK_IP" in action:
-                self._execute_action("block_ip", {
-                    "ip_address": self._get_malicious_ip(bedrock_analysis)
-                })
-            elif "ALERT" in action:
-                self._send_alert("HIGH", bedrock_analysis)
+        self._execute_actions(self._match_actions(self.HIGH_DISPATCH, recommendations, bedrock_analysis))
     
     def _execute_medium_response(
         self,
@@ -115,22 +154,7 @@ class ResponseExecutor:
         self._log_incident(threat_score, bedrock_analysis, "MEDIUM")
         
         # Execute medium-level actions
-        for action in recommendations:
-            if "MONITOR" in action:
-                self._execute_action("enable_monitoring", {
-                    "operator_id": self._get_suspect_operator(bedrock_analysis)
-                })
-            elif "RATE_LIMIT" in action:
-                self._execute_action("rate_limit_operator", {
-                    "operator_id": self._get_suspect_operator(bedrock_analysis),
-                    "limit": "10_requests_per_minute"
-                })
-            elif "REQUIRE_MFA" in action:
-                self._execute_action("require_mfa", {
-                    "operator_id": self._get_suspect_operator(bedrock_analysis)
-                })
-            elif "ALERT" in action:
-                self._send_alert("MEDIUM", bedrock_analysis)
+        self._execute_actions(self._match_actions(self.MEDIUM_DISPATCH, recommendations, bedrock_analysis))
     
     def _execute_low_response(
         self,
@@ -150,47 +174,120 @@ class ResponseExecutor:
             elif "REVIEW" in action:
                 self.logger.info("Manual review recommended")
     
+    def _match_actions(
+        self,
+        dispatch: Dict[str, Any],
+        recommendations: list,
+        bedrock_analysis: Dict
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Map each recommendation to the action of the first dispatch keyword it contains"""
+        pending = []
+        for action in recommendations:
+            for keyword, build in dispatch.items():
+                if keyword in action:
+                    pending.append(build(self, bedrock_analysis))
+                    break
+        return pending
+    
+    def _execute_actions(self, pending: List[Tuple[str, Dict[str, Any]]]) -> List[bool]:
+        """
+        Execute several (action, params) pairs
+        
+        Two or more go to the wrapper as one signed batch request; a wrapper
+        without the batch endpoint gets them individually, concurrently.
+        """
+        if len(pending) <= 1:
+            return [self._execute_action(action, params) for action, params in pending]
+        
+        try:
+            outcomes = self._execute_action_batch(pending)
+        except Exception as e:
+            # Not retried one by one: part of the batch may already have run
+            self.logger.error(f"Failed to execute batch of {len(pending)} actions: {e}")
+            return [False] * len(pending)
+        
+        if outcomes is None:
+            return self._execute_actions_concurrently(pending)
+        return outcomes
+    
+    def _execute_actions_concurrently(self, pending: List[Tuple[str, Dict[str, Any]]]) -> List[bool]:
+        """
+        Execute (action, params) pairs as separate requests
+        
+        Each action is an independent signed POST, so running them on
+        threads over the agent's pooled session overlaps the round-trips.
+        """
+        with ThreadPoolExecutor(max_workers=min(8, len(pending))) as ex:
+            return list(ex.map(lambda item: self._execute_action(*item), pending))
+    
+    @staticmethod
+    def _action_message(action: str, params: Dict[str, Any]) -> bytes:
+        """Canonical bytes signed for one action: action:k1=v1:k2=v2..."""
+        buf = bytearray(action.encode())
+        for k, v in params.items():
+            buf += b":"
+            buf += f"{k}={v}".encode()
+        return bytes(buf)
+    
+    @staticmethod
+    def _action_task(action: str, params: Dict[str, Any]) -> Dict[str, str]:
+        """SDK task carrying one action"""
+        return {"question": f"{action}: {orjson.dumps(params).decode()}"}
+    
+    def _execute_action_batch(self, pending: List[Tuple[str, Dict[str, Any]]]) -> Optional[List[bool]]:
+        """
+        Execute several actions in one request to the wrapper's batch endpoint
+        
+        One signature covers the newline-joined canonical messages of all
+        actions. Returns None if the wrapper has no batch endpoint.
+        """
+        message = b"\n".join([self._action_message(action, params) for action, params in pending])
+        payload = {"tasks": [self._action_task(action, params) for action, params in pending]}
+        
+        response = self.ida_agent.signed_post(
+            f"{self.config.WRAPPER_URL}/api/v1/sdk/execute/batch",
+            message,
+            payload
+        )
+        if response.status_code in (404, 405):
+            return None
+        response.raise_for_status()
+        results = orjson.loads(response.content).get("results") or []
+        
+        outcomes = []
+        for i, (action, _) in enumerate(pending):
+            result = results[i] if i < len(results) else {"status": "error", "message": "no result"}
+            status = result.get("status", "OK") if isinstance(result, dict) else "OK"
+            if status == "error":
+                self.logger.error(f"Failed to execute action '{action}': {result.get('message')}")
+                outcomes.append(False)
+            else:
+                self.logger.info(f"Action executed: {action} -> {status}")
+                outcomes.append(True)
+        return outcomes
+    
     def _execute_action(self, action: str, params: Dict[str, Any]):
         """
         Execute action through Go Wrapper with Ed25519 signature
         Uses correct X-Agent-ID header and endpoint
         """
         try:
-            # Create message to sign
-            message_parts = [action] + [f"{k}={v}" for k, v in params.items()]
-            message = ":".join(message_parts).encode()
-            
-            # Sign with IDA's private key
-            signature = self.ida_agent.private_key.sign(message)
-            signature_hex = signature.hex()
-            
-            # FIXED: Use X-Agent-ID (not X-Operator-ID) to match middleware
-            headers = {
-                "X-Agent-ID": self.ida_agent.agent_name,
-                "X-Signature": signature_hex,
-                "Content-Type": "application/json"
-            }
-            
             # Execute endpoint
             execute_url = f"{self.config.WRAPPER_URL}/api/v1/sdk/execute"
             
             # Payload structure for SDK endpoint
-            payload = {
-                "task": {
-                    "question": f"{action}: {json.dumps(params)}"
-                }
-            }
+            payload = {"task": self._action_task(action, params)}
             
-            # Send to Go Wrapper
-            response = requests.post(
+            # Signed with IDA's private key (X-Agent-ID + X-Signature, as the
+            # middleware expects) and sent over the agent's pooled session
+            response = self.ida_agent.signed_post(
                 execute_url,
-                json=payload,
-                headers=headers,
-                timeout=5
+                self._action_message(action, params),
+                payload
             )
             
             response.raise_for_status()
-            result = response.json()
+            result = orjson.loads(response.content)
             
             self.logger.info(f"Action executed: {action} -> {result.get('status', 'OK')}")
             return True
@@ -220,11 +317,39 @@ class ResponseExecutor:
             "ida_agent": self.ida_agent.agent_name
         }
         
+        if severity == "LOW":
+            # LOW threats can fire every cycle; one POST per batch instead of per incident
+            self._low_incident_buffer.append(incident_log)
+            if len(self._low_incident_buffer) >= self.LOW_INCIDENT_BATCH:
+                self.flush_low_incidents()
+            else:
+                self.flush_low_incidents_if_due()
+            return
+        
+        # Keep the audit trail in order: buffered LOW incidents go first
+        self.flush_low_incidents()
+        
         # Execute logging through wrapper (immutable audit trail)
         self._execute_action("log_security_event", incident_log)
     
-    def _send_alert(self, severity: str, bedrock_analysis: Dict):
-        """Send alert to security team"""
+    def flush_low_incidents(self):
+        """Send buffered LOW incidents to the wrapper in one log_security_event_batch action"""
+        self._last_low_flush = time.time()
+        if not self._low_incident_buffer:
+            return
+        
+        # Kept for the next flush if the wrapper did not record them
+        if self._execute_action("log_security_event_batch", {"events": list(self._low_incident_buffer)}):
+            self._low_incident_buffer.clear()
+    
+    def flush_low_incidents_if_due(self):
+        """Flush buffered LOW incidents once LOW_INCIDENT_FLUSH_SECONDS have passed since the last flush"""
+        if (self._low_incident_buffer
+                and time.time() - self._last_low_flush > self.LOW_INCIDENT_FLUSH_SECONDS):
+            self.flush_low_incidents()
+    
+    def _prepare_alert(self, severity: str, bedrock_analysis: Dict) -> Tuple[str, Dict[str, Any]]:
+        """Log an alert for the security team and return its send_alert action"""
         alert = {
             "severity": severity,
             "classification": bedrock_analysis.get("classification"),
@@ -236,25 +361,23 @@ class ResponseExecutor:
         self.logger.warning(f"Recommendations: {alert['recommendations']}\n")
         
         # In production, send email/Slack notification
-        self._execute_action("send_alert", alert)
+        return ("send_alert", alert)
     
     def _get_suspect_operator(self, bedrock_analysis: Dict) -> str:
         """Extract suspect operator from analysis"""
-        reasoning = bedrock_analysis.get("reasoning", "")
-        if "operator" in reasoning.lower():
+        if "operator" in _reasoning_keywords(bedrock_analysis.get("reasoning", "")):
             return "operator_under_suspicion"
         return "unknown_operator"
     
     def _get_suspect_device(self, bedrock_analysis: Dict) -> str:
         """Extract suspect device from analysis"""
-        reasoning = bedrock_analysis.get("reasoning", "")
-        if "device" in reasoning.lower():
+        if "device" in _reasoning_keywords(bedrock_analysis.get("reasoning", "")):
             return "device_under_suspicion"
         return "unknown_device"
     
     def _get_malicious_ip(self, bedrock_analysis: Dict) -> str:
         """Extract malicious IP from analysis"""
-        reasoning = bedrock_analysis.get("reasoning", "")
-        if "impossible travel" in reasoning.lower() or "ip" in reasoning.lower():
+        keywords = _reasoning_keywords(bedrock_analysis.get("reasoning", ""))
+        if "impossible travel" in keywords or "ip" in keywords:
             return "malicious_ip"
         return "unknown_ip"
\ No newline at end of file
@@ -2,17 +2,160 @@
 Bedrock Reasoner - Uses AWS Bedrock AI to analyze threats and recommend actions
 """
 
-from typing import Dict, Any, Optional
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
+import asyncio
 import json
 import logging
+import orjson
+import threading
+import time
 
-try:
-    import boto3
-    from strands import Agent
-    from strands.models import BedrockModel
-    BEDROCK_AVAILABLE = True
-except ImportError:
-    BEDROCK_AVAILABLE = False
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _extract_json(text: str) -> Optional[Any]:
+    """The first JSON object in a model response, or None if there is none"""
+    text = text.strip()
+    # Usually the whole response is the JSON object
+    if text.startswith("{") and text.endswith("}"):
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # e.g. NaN, which only the stdlib decoder below accepts
+            pass
+    # Otherwise decode from each "{" until one parses; raw_decode stops at the
+    # object's matching brace and handles strings, so prose around it is ignored
+    start = text.find("{")
+    while start != -1:
+        try:
+            return _JSON_DECODER.raw_decode(text, start)[0]
+        except ValueError:
+            start = text.find("{", start + 1)
+    return None
+
+
+_PROMPT_PREAMBLE = """CYBERSECURITY THREAT ANALYSIS REQUEST
+
+You are a cybersecurity expert analyzing a potential attack on an industrial SCADA system."""
+
+# Numbered questions asked about every threat
+_PROMPT_QUESTIONS = """1. Is this a cyberattack? What type?
+2. How confident are you (0-100%)?
+3. What is the classification? (e.g., Credential Compromise, DoS, Insider Threat, etc)
+4. What immediate actions should be taken to stop the attack?
+5. What is the urgency level? (CRITICAL, HIGH, MEDIUM, LOW)"""
+
+_ANALYSIS_SCHEMA = """{
+  "is_attack": true/false,
+  "classification": "Attack Type",
+  "confidence": 0-100,
+  "reasoning": "Detailed explanation",
+  "recommendations": ["Action 1", "Action 2", "Action 3"],
+  "urgency": "CRITICAL/HIGH/MEDIUM/LOW"
+}"""
+
+# Everything of the single-threat prompt around its indicator block
+_SINGLE_PROMPT_HEAD = _PROMPT_PREAMBLE + "\n\n"
+_SINGLE_PROMPT_TAIL = (
+    "\n\nQUESTION:\nBased on these threat indicators, please analyze:\n"
+    + _PROMPT_QUESTIONS
+    + "\n\nPlease respond in JSON format:\n"
+    + _ANALYSIS_SCHEMA
+)
+
+
+# Rule-based analyses for the fallback, shared read-only: _FALLBACK_ANALYSES[i]
+# applies from _FALLBACK_THRESHOLDS[i - 1] up to the next threshold
+_FALLBACK_THRESHOLDS = (30, 50, 70, 90)
+_FALLBACK_ANALYSES = tuple(MappingProxyType(analysis) for analysis in (
+    {
+        "is_attack": False,
+        "classification": "NORMAL",
+        "confidence": 95,
+        "reasoning": "No significant threat indicators detected.",
+        "recommendations": [],
+        "urgency": "NONE"
+    },
+    {
+        "is_attack": False,
+        "classification": "LOW THREAT - Anomalous Activity",
+        "confidence": 60,
+        "reasoning": "Minor threat signals detected. Monitor for escalation.",
+        "recommendations": [
+            "MONITOR",
+            "LOG_EVENT",
+            "REVIEW_MANUALLY"
+        ],
+        "urgency": "LOW"
+    },
+    {
+        "is_attack": True,
+        "classification": "MEDIUM THREAT - Suspicious Activity",
+        "confidence": 70,
+        "reasoning": "Moderate threat indicators suggest possible intrusion attempt.",
+        "recommendations": [
+            "MONITOR_CLOSELY",
+            "RATE_LIMIT_OPERATOR",
+            "REQUIRE_MFA",
+            "LOG_EVENT"
+        ],
+        "urgency": "MEDIUM"
+    },
+    {
+        "is_attack": True,
+        "classification": "HIGH THREAT - Credential Compromise/DoS",
+        "confidence": 80,
+        "reasoning": "Multiple threat signals indicate active attack in progress.",
+        "recommendations": [
+            "LOCK_SUSPECT_ACCOUNT",
+            "REVOKE_ACTIVE_SESSIONS",
+            "ISOLATE_DEVICE",
+            "BLOCK_MALICIOUS_IP",
+            "ALERT_ADMIN"
+        ],
+        "urgency": "HIGH"
+    },
+    {
+        "is_attack": True,
+        "classification": "CRITICAL THREAT",
+        "confidence": 85,
+        "reasoning": "Multiple high-severity threat indicators detected. System compromise likely.",
+        "recommendations": [
+            "EMERGENCY_SHUTDOWN",
+            "LOCK_ALL_ACCOUNTS",
+            "ISOLATE_NETWORK_SEGMENT",
+            "ALERT_SECURITY_TEAM",
+            "PRESERVE_AUDIT_LOGS"
+        ],
+        "urgency": "CRITICAL"
+    },
+))
+
+
+def _get_bedrock_model(aws_clients, model_id: str, temperature: float):
+    """
+    The shared BedrockModel for a config's session, a model and a temperature
+
+    Cached on the config's AWSClients, so reasoners built from the same config
+    share one model and its bedrock-runtime client.
+    """
+    models = aws_clients.bedrock_models
+    key = (model_id, temperature)
+    model = models.get(key)
+    if model is None:
+        from strands.models import BedrockModel
+        model = models[key] = BedrockModel(
+            boto_session=aws_clients.session,
+            boto_client_config=aws_clients.bedrock_runtime_config,
+            model_id=model_id,
+            temperature=temperature,
+        )
+    return model
 
 
 class BedrockReasoner:
@@ -21,34 +164,60 @@ class BedrockReasoner:
     Asks: "Is this a threat? What should we do?"
     """
     
+    # Bedrock answers reused for a repeated prompt (same score and signals)
+    ANALYSIS_CACHE_SIZE = 1024
+    ANALYSIS_CACHE_TTL = 60  # seconds, so a classification is never older than this
+    
     def __init__(self, config, logger: logging.Logger):
         self.config = config
         self.logger = logger
         self.agent = None
         self.initialized = False
         
-        if BEDROCK_AVAILABLE:
-            self._initialize_bedrock()
-        else:
-            self.logger.warning("Bedrock not available, using fallback reasoning")
+        # Bedrock calls are I/O-bound, so the pool is sized well past the CPU count
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.BEDROCK_WORKERS,
+            thread_name_prefix="bedrock"
+        )
+        # An Agent keeps its conversation, so each worker thread gets its own
+        # (all on the one shared BedrockModel)
+        self._model = None
+        self._agent_cls = None
+        self._local = threading.local()
+        
+        # prompt -> (expiry on time.monotonic(), analysis), least recently used first
+        self._analysis_cache = OrderedDict()
+        self._analysis_cache_lock = threading.Lock()
+        
+        # Micro-batching for analyze_threat_batched, started on first use in
+        # each event loop (a queue and its drainer only work on their own loop)
+        self._batch_loop = None
+        self._batch_queue = None
+        self._batch_task = None
+        
+        self._initialize_bedrock()
     
     def _initialize_bedrock(self):
         """Initialize Bedrock agent"""
+        # Imported here rather than at module load: strands pulls in botocore,
+        # which costs hundreds of ms for processes that never build a reasoner
         try:
-            session = boto3.Session(
-                aws_access_key_id=self.config.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=self.config.AWS_SECRET_ACCESS_KEY,
-                region_name=self.config.AWS_REGION
-            )
-                        
-            nova_model = BedrockModel(
-                boto_session=session,  # optional, can omit if using env vars
-                model_id="us.amazon.nova-premier-v1:0",  # exact model ID from AWS Console
-                temperature= 0.8,
-
+            from strands import Agent
+        except ImportError:
+            self.logger.warning("Bedrock not available, using fallback reasoning")
+            return
+        
+        try:
+            # Shares the session main.py's Bedrock probe already built for this config
+            nova_model = _get_bedrock_model(
+                self.config.aws_clients,
+                "us.amazon.nova-premier-v1:0",  # exact model ID from AWS Console
+                0.8
             )
             
-            self.agent = Agent(model=nova_model)
+            self._model = nova_model
+            self._agent_cls = Agent
+            self.agent = self._local.agent = Agent(model=nova_model)
             self.initialized = True
             self.logger.info("[OK] Bedrock initialized successfully")
         except Exception as e:
@@ -74,26 +243,186 @@ class BedrockReasoner:
         }
         """
         
-        if not self.initialized:
+        # Below the cutoff the fallback's NORMAL/LOW verdict is good enough; skip the round trip
+        if not self.initialized or threat_score < self.config.BEDROCK_MIN_SCORE:
             return self._fallback_analysis(threat_score, threat_data)
         
         try:
             # Format threat data for Bedrock
             prompt = self._format_threat_prompt(threat_score, threat_data, audit_logs)
             
+            # The prompt holds exactly the score and signals, so it keys the cache
+            analysis = self._cached_analysis(prompt)
+            if analysis is not None:
+                self.logger.debug("Reusing cached Bedrock analysis for an identical threat")
+                return analysis
+            
             self.logger.debug(f"Asking Bedrock: {prompt[:200]}...")
             
             # Query Bedrock
-            response = self.agent(prompt)
+            response = self._thread_agent()(prompt)
             
             # Parse response
             analysis = self._parse_bedrock_response(response, threat_score)
+            if not any(analysis is fallback for fallback in _FALLBACK_ANALYSES):
+                self._cache_analysis(prompt, analysis)
             return analysis
         
         except Exception as e:
             self.logger.error(f"Bedrock analysis error: {e}")
             return self._fallback_analysis(threat_score, threat_data)
     
+    def _cached_analysis(self, prompt: str) -> Optional[Dict[str, Any]]:
+        """The unexpired cached analysis for prompt, if any"""
+        with self._analysis_cache_lock:
+            entry = self._analysis_cache.get(prompt)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._analysis_cache[prompt]
+                return None
+            self._analysis_cache.move_to_end(prompt)
+            return entry[1]
+    
+    def _cache_analysis(self, prompt: str, analysis: Dict[str, Any]):
+        """Remember Bedrock's analysis of prompt, evicting the least recently used"""
+        with self._analysis_cache_lock:
+            self._analysis_cache[prompt] = (time.monotonic() + self.ANALYSIS_CACHE_TTL, analysis)
+            self._analysis_cache.move_to_end(prompt)
+            if len(self._analysis_cache) > self.ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
+    
+    async def analyze_threat_async(
+        self,
+        threat_score: int,
+        threat_data: Dict[str, Any],
+        audit_logs: list
+    ) -> Optional[Dict[str, Any]]:
+        """analyze_threat on the reasoner's thread pool, so many threats can be analyzed at once"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self.analyze_threat, threat_score, threat_data, audit_logs
+        )
+    
+    def analyze_threats_batch(
+        self,
+        threats: List[Tuple[int, Dict[str, Any], list]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Analyze several (threat_score, threat_data, audit_logs) threats with one Bedrock call
+        
+        Returns one analysis (as from analyze_threat) per threat, in order.
+        """
+        if len(threats) == 1:
+            return [self.analyze_threat(*threats[0])]
+        if not self.initialized:
+            return [self._fallback_analysis(score, data) for score, data, _ in threats]
+        
+        # Threats under the cutoff get the fallback; only the rest are sent
+        cutoff = self.config.BEDROCK_MIN_SCORE
+        if any(score < cutoff for score, _, _ in threats):
+            results = [
+                self._fallback_analysis(score, data) if score < cutoff else None
+                for score, data, _ in threats
+            ]
+            asked = [i for i, result in enumerate(results) if result is None]
+            if asked:
+                for i, analysis in zip(asked, self.analyze_threats_batch([threats[i] for i in asked])):
+                    results[i] = analysis
+            return results
+        
+        try:
+            prompt = self._format_batch_prompt(threats)
+            
+            self.logger.debug(f"Asking Bedrock about {len(threats)} threats: {prompt[:200]}...")
+            
+            response = self._thread_agent()(prompt)
+            return self._parse_batch_response(response, [score for score, _, _ in threats])
+        
+        except Exception as e:
+            self.logger.error(f"Bedrock batch analysis error: {e}")
+            return [self._fallback_analysis(score, data) for score, data, _ in threats]
+    
+    # Threats arriving within BATCH_WINDOW seconds of the first, up to
+    # BATCH_MAX of them, share one Bedrock call
+    BATCH_MAX = 8
+    BATCH_WINDOW = 0.05
+    
+    async def analyze_threat_batched(
+        self,
+        threat_score: int,
+        threat_data: Dict[str, Any],
+        audit_logs: list
+    ) -> Optional[Dict[str, Any]]:
+        """analyze_threat through the micro-batch queue of the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._batch_loop is not loop or self._batch_task.done():
+            self._batch_loop = loop
+            self._batch_queue = asyncio.Queue()
+            self._batch_task = loop.create_task(self._drain_batches(self._batch_queue))
+        
+        future = loop.create_future()
+        self._batch_queue.put_nowait(((threat_score, threat_data, audit_logs), future))
+        return await future
+    
+    async def aclose(self):
+        """Stop the micro-batch drainer; threats still waiting on it are cancelled"""
+        task = self._batch_task
+        self._batch_loop = self._batch_queue = self._batch_task = None
+        if task is None or task.done():
+            return
+        task.cancel()
+        if task.get_loop() is asyncio.get_running_loop():
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+    
+    async def _drain_batches(self, queue: asyncio.Queue):
+        """Collect queued threats into batches and resolve their futures"""
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while True:
+                batch = [await queue.get()]
+                deadline = loop.time() + self.BATCH_WINDOW
+                while len(batch) < self.BATCH_MAX:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                
+                try:
+                    results = await loop.run_in_executor(
+                        self._executor, self.analyze_threats_batch, [threat for threat, _ in batch]
+                    )
+                except Exception as e:
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+        finally:
+            # Cancelled by aclose or by its loop shutting down: nobody will
+            # drain this queue again, so its callers must not wait forever
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            for _, future in batch:
+                future.cancel()
+    
+    def _thread_agent(self):
+        """The calling thread's Agent, created on its first Bedrock call"""
+        agent = getattr(self._local, "agent", None)
+        if agent is None:
+            agent = self._local.agent = self._agent_cls(model=self._model)
+        return agent
+    
     def _format_threat_prompt(
         self,
         threat_score: int,
@@ -101,16 +430,44 @@ class BedrockReasoner:
         audit_logs: list
     ) -> str:
         """Format threat data into a prompt for Bedrock"""
+        return _SINGLE_PROMPT_HEAD + self._format_threat_block(None, threat_score, threat_data) + _SINGLE_PROMPT_TAIL
+    
+    def _format_batch_prompt(self, threats: List[Tuple[int, Dict, list]]) -> str:
+        """Format several threats into one prompt asking for an array of analyses"""
+        blocks = "\n\n".join(
+            self._format_threat_block(i, threat_score, threat_data)
+            for i, (threat_score, threat_data, _) in enumerate(threats, 1)
+        )
+        schema = _ANALYSIS_SCHEMA.replace("\n", "\n    ")
+        
+        prompt = f"""{_PROMPT_PREAMBLE}
+The {len(threats)} threats below were detected independently; analyze each one on its own.
+
+{blocks}
+
+QUESTION:
+For each threat, please analyze:
+{_PROMPT_QUESTIONS}
+
+Please respond in JSON format, with one analysis per threat in threat order:
+{{
+  "analyses": [
+    {schema}
+  ]
+}}"""
         
+        return prompt
+    
+    def _format_threat_block(self, index: Optional[int], threat_score: int, threat_data: Dict) -> str:
+        """The indicator section for one threat, numbered when part of a batch"""
+        # One f-string compiles to a single BUILD_STRING; measured faster than
+        # joining per-line pieces or str.format_map over a merged dict
         behavior = threat_data.get("operator_behavior", {})
         commands = threat_data.get("command_patterns", {})
         network = threat_data.get("network_activity", {})
+        title = "THREAT INDICATORS" if index is None else f"THREAT {index} INDICATORS"
         
-        prompt = f"""CYBERSECURITY THREAT ANALYSIS REQUEST
-
-You are a cybersecurity expert analyzing a potential attack on an industrial SCADA system.
-
-THREAT INDICATORS (Score: {threat_score}/100):
+        return f"""{title} (Score: {threat_score}/100):
 
 Operator Behavior Anomalies:
 - Failed login attempts: {behavior.get('failed_login_attempts', 0)}/100
@@ -128,37 +485,14 @@ Command Pattern Anomalies:
 Network Activity Anomalies:
 - Impossible travel (IP location): {network.get('impossible_travel', 0)}/100
 - Unauthorized IP: {network.get('unauthorized_ip', 0)}/100
-- Protocol violation: {network.get('protocol_violation', 0)}/100
-
-QUESTION:
-Based on these threat indicators, please analyze:
-1. Is this a cyberattack? What type?
-2. How confident are you (0-100%)?
-3. What is the classification? (e.g., Credential Compromise, DoS, Insider Threat, etc)
-4. What immediate actions should be taken to stop the attack?
-5. What is the urgency level? (CRITICAL, HIGH, MEDIUM, LOW)
-
-Please respond in JSON format:
-{{
-  "is_attack": true/false,
-  "classification": "Attack Type",
-  "confidence": 0-100,
-  "reasoning": "Detailed explanation",
-  "recommendations": ["Action 1", "Action 2", "Action 3"],
-  "urgency": "CRITICAL/HIGH/MEDIUM/LOW"
-}}"""
-        
-        return prompt
+- Protocol violation: {network.get('protocol_violation', 0)}/100"""
     
     def _parse_bedrock_response(self, response: str, threat_score: int) -> Dict[str, Any]:
         """Parse Bedrock's response"""
         try:
             # Try to extract JSON from response
-            import re
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                analysis = json.loads(json_match.group())
-            else:
+            analysis = _extract_json(str(response))
+            if analysis is None:
                 # Fallback if no JSON found
                 analysis = self._fallback_analysis(threat_score, {})
             
@@ -167,74 +501,25 @@ Please respond in JSON format:
             self.logger.error(f"Failed to parse Bedrock response: {e}")
             return self._fallback_analysis(threat_score, {})
     
-    def _fallback_analysis(self, threat_score: int, threat_data: Dict) -> Dict[str, Any]:
+    def _parse_batch_response(self, response: str, threat_scores: List[int]) -> List[Dict[str, Any]]:
+        """Parse a batch response; threats Bedrock left out get the fallback analysis"""
+        analyses = []
+        try:
+            batch = _extract_json(str(response))
+            if batch is not None:
+                analyses = batch.get("analyses") or []
+        except Exception as e:
+            self.logger.error(f"Failed to parse Bedrock batch response: {e}")
+        
+        return [
+            analyses[i] if i < len(analyses) and isinstance(analyses[i], dict)
+            else self._fallback_analysis(threat_score, {})
+            for i, threat_score in enumerate(threat_scores)
+        ]
+    
+    def _fallback_analysis(self, threat_score: int, threat_data: Dict) -> Mapping[str, Any]:
         """
         Fallback analysis when Bedrock is not available
         Uses rule-based classification
         """
-        if threat_score >= 90:
-            return {
-                "is_attack": True,
-                "classification": "CRITICAL THREAT",
-                "confidence": 85,
-                "reasoning": "Multiple high-severity threat indicators detected. System compromise likely.",
-                "recommendations": [
-                    "EMERGENCY_SHUTDOWN",
-                    "LOCK_ALL_ACCOUNTS",
-                    "ISOLATE_NETWORK_SEGMENT",
-                    "ALERT_SECURITY_TEAM",
-                    "PRESERVE_AUDIT_LOGS"
-                ],
-                "urgency": "CRITICAL"
-            }
-        elif threat_score >= 70:
-            return {
-                "is_attack": True,
-                "classification": "HIGH THREAT - Credential Compromise/DoS",
-                "confidence": 80,
-                "reasoning": "Multiple threat signals indicate active attack in progress.",
-                "recommendations": [
-                    "LOCK_SUSPECT_ACCOUNT",
-                    "REVOKE_ACTIVE_SESSIONS",
-                    "ISOLATE_DEVICE",
-                    "BLOCK_MALICIOUS_IP",
-                    "ALERT_ADMIN"
-                ],
-                "urgency": "HIGH"
-            }
-        elif threat_score >= 50:
-            return {
-                "is_attack": True,
-                "classification": "MEDIUM THREAT - Suspicious Activity",
-                "confidence": 70,
-                "reasoning": "Moderate threat indicators suggest possible intrusion attempt.",
-                "recommendations": [
-                    "MONITOR_CLOSELY",
-                    "RATE_LIMIT_OPERATOR",
-                    "REQUIRE_MFA",
-                    "LOG_EVENT"
-                ],
-                "urgency": "MEDIUM"
-            }
-        elif threat_score >= 30:
-            return {
-                "is_attack": False,
-                "classification": "LOW THREAT - Anomalous Activity",
-                "confidence": 60,
-                "reasoning": "Minor threat signals detected. Monitor for escalation.",
-                "recommendations": [
-                    "MONITOR",
-                    "LOG_EVENT",
-                    "REVIEW_MANUALLY"
-                ],
-                "urgency": "LOW"
-            }
-        else:
-            return {
-                "is_attack": False,
-                "classification": "NORMAL",
-                "confidence": 95,
-                "reasoning": "No significant threat indicators detected.",
-                "recommendations": [],
-                "urgency": "NONE"
-            }
\ No newline at end of file
+        return _FALLBACK_ANALYSES[bisect_right(_FALLBACK_THRESHOLDS, threat_score)]
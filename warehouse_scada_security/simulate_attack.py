@@ -17,15 +17,14 @@ import json
 def generate_brute_force_events():
     """Generate mock brute force attack audit events"""
     
-    events = []
     base_time = int(datetime.now().timestamp())
     
     # Simulate 8 failed login attempts from attacker
     print("Generating brute force attack events...")
     print("="*70)
     
-    for i in range(8):
-        event = {
+    events = [
+        {
             "event_id": f"evt_mock_{i}",
             "timestamp": base_time - (8-i)*5,  # 5 seconds apart
             "event_type": "REGISTER",
@@ -38,8 +37,10 @@ def generate_brute_force_events():
                 "ip": "192.168.1.100"
             }
         }
-        events.append(event)
-        print(f"Event {i+1}: Failed login attempt by attacker_attempt_{i}")
+        for i in range(8)
+    ]
+    # One write for the whole listing
+    print("\n".join(f"Event {i+1}: Failed login attempt by attacker_attempt_{i}" for i in range(len(events))))
     
     print("="*70)
     print(f"\nGenerated {len(events)} mock audit events")
@@ -61,67 +62,70 @@ def create_test_scenario():
     This will be used to test IDA's threat detection
     """
     
-    print("\n" + "="*70)
-    print("BRUTE FORCE ATTACK SIMULATION")
-    print("="*70 + "\n")
+    sys.stdout.write("\n" + "="*70 + "\nBRUTE FORCE ATTACK SIMULATION\n" + "="*70 + "\n\n")
     
     # Generate events
     events = generate_brute_force_events()
     
     # Show threat pattern from config
-    print("\n" + "="*70)
-    print("THREAT PATTERN DEFINITION (from threat_rules.yaml)")
-    print("="*70)
+    Config.initialize()
+    out = []
+    out.append("\n" + "="*70)
+    out.append("THREAT PATTERN DEFINITION (from threat_rules.yaml)")
+    out.append("="*70)
     
     brute_force_pattern = Config.get_threat_pattern("brute_force")
     if brute_force_pattern:
-        print(f"Pattern: brute_force")
-        print(f"Description: {brute_force_pattern['description']}")
-        print(f"Indicators:")
+        out.append(f"Pattern: brute_force")
+        out.append(f"Description: {brute_force_pattern['description']}")
+        out.append(f"Indicators:")
         for key, value in brute_force_pattern['indicators'].items():
-            print(f"  - {key}: {value}")
-        print(f"Severity: {brute_force_pattern['severity']}")
-        print(f"Actions: {', '.join(brute_force_pattern['actions'])}")
+            out.append(f"  - {key}: {value}")
+        out.append(f"Severity: {brute_force_pattern['severity']}")
+        out.append(f"Actions: {', '.join(brute_force_pattern['actions'])}")
     
     # Show expected threat score
-    print("\n" + "="*70)
-    print("THREAT ANALYSIS")
-    print("="*70)
-    print(f"Event Count: {len(events)}")
-    print(f"Event Type: Failed Authentication")
-    print(f"Time Window: 40 seconds")
-    print(f"Source IP: 192.168.1.100")
-    print(f"Unique Operators: 8")
+    out.append("\n" + "="*70)
+    out.append("THREAT ANALYSIS")
+    out.append("="*70)
+    out.append(f"Event Count: {len(events)}")
+    out.append(f"Event Type: Failed Authentication")
+    out.append(f"Time Window: 40 seconds")
+    out.append(f"Source IP: 192.168.1.100")
+    out.append(f"Unique Operators: 8")
     
-    print(f"\nBased on threat pattern 'brute_force':")
-    print(f"  Failed logins in 5min: 8 (threshold: 3) - EXCEEDED")
-    print(f"  Threshold threat score: 50")
-    print(f"\nExpected IDA Detection:")
-    print(f"  Threat Score: 60-75/100 (HIGH)")
-    print(f"  Threat Level: HIGH")
-    print(f"  Will trigger: MEDIUM/HIGH response actions")
+    out.append(f"\nBased on threat pattern 'brute_force':")
+    out.append(f"  Failed logins in 5min: 8 (threshold: 3) - EXCEEDED")
+    out.append(f"  Threshold threat score: 50")
+    out.append(f"\nExpected IDA Detection:")
+    out.append(f"  Threat Score: 60-75/100 (HIGH)")
+    out.append(f"  Threat Level: HIGH")
+    out.append(f"  Will trigger: MEDIUM/HIGH response actions")
     
-    print("\n" + "="*70)
-    print("HOW TO RUN THIS TEST")
-    print("="*70)
-    print("1. In Terminal 1: Run IDA agent")
-    print("   cd warehouse_scada_security/ida-agent")
-    print("   python main.py")
-    print("")
-    print("2. In Terminal 2: Run this attack simulation")
-    print("   cd warehouse_scada_security")
-    print("   python simulate_attack.py")
-    print("")
-    print("3. Watch Terminal 1 for threat detection output")
-    print("")
-    print("Expected IDA Output:")
-    print("  [IDA] Threat Assessment: Score=65/100")
-    print("  [IDA] Operator Behavior Analysis:")
-    print("  [IDA]   failed_login_attempts: 83/100 [HIGH]")
-    print("  [IDA] THREAT DETECTED - Invoking AI analysis")
-    print("  [IDA] Bedrock Classification: Brute Force Attack")
-    print("  [IDA] Actions: Lock accounts, Alert admin")
-    print("="*70 + "\n")
+    out.append("\n" + "="*70)
+    out.append("HOW TO RUN THIS TEST")
+    out.append("="*70)
+    out.append("1. In Terminal 1: Run IDA agent")
+    out.append("   cd warehouse_scada_security/ida-agent")
+    out.append("   python main.py")
+    out.append("")
+    out.append("2. In Terminal 2: Run this attack simulation")
+    out.append("   cd warehouse_scada_security")
+    out.append("   python simulate_attack.py")
+    out.append("")
+    out.append("3. Watch Terminal 1 for threat detection output")
+    out.append("")
+    out.append("Expected IDA Output:")
+    out.append("  [IDA] Threat Assessment: Score=65/100")
+    out.append("  [IDA] Operator Behavior Analysis:")
+    out.append("  [IDA]   failed_login_attempts: 83/100 [HIGH]")
+    out.append("  [IDA] THREAT DETECTED - Invoking AI analysis")
+    out.append("  [IDA] Bedrock Classification: Brute Force Attack")
+    out.append("  [IDA] Actions: Lock accounts, Alert admin")
+    out.append("="*70 + "\n")
+    
+    # One write for the whole report instead of a print per line
+    sys.stdout.write("\n".join(out) + "\n")
     
     return events
 
@@ -9,7 +9,7 @@ from src.analysis.threat_scorer import ThreatScorer
 import logging
 
 # Setup
-config = Config()
+config = Config.from_env()
 logger = logging.getLogger("TEST")
 logger.setLevel(logging.INFO)
 handler = logging.StreamHandler()